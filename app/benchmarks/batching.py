@@ -0,0 +1,85 @@
+"""
+Cloe Micro-Batching Benchmark
+
+Copyright (C) `2021-2022` `<Alarcon Ace Belen>`
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <http://www.gnu.org/licenses/>.
+"""
+
+import argparse
+from time import perf_counter
+
+from PIL import Image, ImageDraw
+
+from components.services import InferenceExecutor
+from utils.ocr import MicroBatcher, StubEngine, createEngine
+from utils.scripts import imagesToText
+
+ROUNDS = 5
+
+
+def createImages(count: int) -> list[Image.Image]:
+    images = []
+    for i in range(count):
+        image = Image.new("RGB", (160, 320), "white")
+        ImageDraw.Draw(image).text((70, 20 + i), "テスト", fill="black")
+        images.append(image)
+    return images
+
+
+def measure(executor: InferenceExecutor, count: int, batched: bool) -> float:
+    """Returns the mean ms until the texts of all images are back
+
+    The images are converted the way the app does: by tasks on the executor, all
+    in one ocrBatch call like the marked regions, or one task per image like the
+    previews.
+    """
+    images = createImages(count)
+    groups = [images] if batched else [[image] for image in images]
+    total = 0.0
+    for _ in range(ROUNDS):
+        start = perf_counter()
+        futures = [
+            executor.submit(
+                imagesToText, group, executor.model, priority=InferenceExecutor.FINAL
+            )
+            for group in groups
+        ]
+        for future in futures:
+            future.result()
+        total += perf_counter() - start
+    return 1000 * total / ROUNDS
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Compares converting images in one batch with one at a time, "
+        "through the inference executor like the app"
+    )
+    parser.add_argument("--real", action="store_true", help="Use the MangaOCR model")
+    args = parser.parse_args()
+
+    # The stub costs a fixed overhead per batch plus a time per image
+    engine = createEngine("manga_ocr") if args.real else StubEngine(80, 10)
+    executor = InferenceExecutor()
+    executor.model = MicroBatcher(engine)
+
+    print(f"{'images':>6} {'batched (ms)':>13} {'one by one (ms)':>16} {'speedup':>8}")
+    for count in range(1, executor.model.maxBatch + 1):
+        batched = measure(executor, count, True)
+        separate = measure(executor, count, False)
+        print(
+            f"{count:>6} {batched:>13.1f} {separate:>16.1f} {separate / batched:>8.2f}"
+        )
+    executor.model.close()
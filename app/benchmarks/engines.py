@@ -0,0 +1,88 @@
+"""
+Cloe Benchmarks
+
+Copyright (C) `2021-2022` `<Alarcon Ace Belen>`
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <http://www.gnu.org/licenses/>.
+"""
+
+import argparse
+import json
+import sys
+
+from benchmarks.isolated import (
+    characterErrorRate,
+    defaultFixtures,
+    measureEngine,
+    runIsolated,
+)
+from cli import findImages
+from utils.constants import OCR_DEFAULT
+from utils.ocr import ENGINES, createEngine, engineOptions
+
+
+def run(name: str, fixtures: str):
+    """
+    Measures one engine in isolation and prints its results as JSON
+    """
+    engine = createEngine(name, **engineOptions(name, OCR_DEFAULT))
+    print(json.dumps(measureEngine(engine, fixtures), ensure_ascii=False))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Compares the latency, memory and texts of the OCR engines "
+        "against the first one"
+    )
+    parser.add_argument(
+        "--fixtures",
+        help="Directory of images. Defaults to the examples shipped with manga_ocr.",
+    )
+    parser.add_argument(
+        "--engines",
+        choices=ENGINES,
+        nargs="+",
+        default=list(ENGINES),
+        help="Engines to compare",
+    )
+    parser.add_argument("--engine", choices=ENGINES, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    args.fixtures = defaultFixtures(args.fixtures)
+
+    if args.engine:
+        run(args.engine, args.fixtures)
+        sys.exit()
+
+    results = runIsolated("benchmarks.engines", "--engine", args.engines, args.fixtures)
+
+    paths = findImages(args.fixtures)
+    reference = args.engines[0]
+    references = results.get(reference, {}).get("texts", [])
+    print(f"{len(paths)} fixtures in {args.fixtures}, compared with {reference}")
+    print(
+        f"{'engine':>9} {'latency (ms)':>13} {'RSS (MB)':>9} {'model (MB)':>11}"
+        f" {'same':>5} {'CER':>6}"
+    )
+    for name, result in results.items():
+        same = sum(t == r for t, r in zip(result["texts"], references))
+        cer = characterErrorRate(result["texts"], references)
+        print(
+            f"{name:>9} {result['meanMs']:>13.1f} {result['residentMB']:>9.1f}"
+            f" {result['modelMB']:>11.1f} {same:>2}/{len(references):<2} {cer:>6.3f}"
+        )
+        if name == reference:
+            continue
+        for path, t, r in zip(paths, result["texts"], references):
+            if t != r:
+                print(f"{name} differs on {path}: {t!r} instead of {r!r}")
@@ -0,0 +1,103 @@
+"""
+Cloe Benchmarks
+
+Copyright (C) `2021-2022` `<Alarcon Ace Belen>`
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <http://www.gnu.org/licenses/>.
+"""
+
+import argparse
+import sys
+from functools import partial
+from threading import Event, Thread
+from time import perf_counter
+
+from PyQt5.QtCore import QEventLoop, Qt, QTimer
+from PyQt5.QtWidgets import QApplication
+
+from utils.ocr import MicroBatcher, ProcessBatcher, createEngine, loadEngine
+from utils.ocr.warmup import syntheticImage
+
+FRAME_MS = 16
+SECONDS = 3.0
+
+
+def measure(batcher) -> list[float]:
+    """
+    Returns the intervals in ms of a 16 ms timer while OCR runs without pause
+    """
+    stop = Event()
+    image = syntheticImage((200, 200))
+
+    def ocrLoop():
+        while not stop.is_set() and batcher is not None:
+            batcher.ocr(image)
+
+    intervals = []
+    last = [perf_counter()]
+
+    def tick():
+        now = perf_counter()
+        intervals.append((now - last[0]) * 1000)
+        last[0] = now
+
+    timer = QTimer()
+    timer.setTimerType(Qt.PreciseTimer)
+    timer.timeout.connect(tick)
+    timer.start(FRAME_MS)
+    thread = Thread(target=ocrLoop, daemon=True)
+    thread.start()
+
+    loop = QEventLoop()
+    QTimer.singleShot(int(SECONDS * 1000), loop.quit)
+    loop.exec_()
+    timer.stop()
+    stop.set()
+    thread.join()
+    return sorted(intervals)
+
+
+def report(mode: str, intervals: list[float]):
+    jitter = sorted(abs(i - FRAME_MS) for i in intervals)
+    print(
+        f"{mode:>8} frames={len(intervals):>4}"
+        f" p50={jitter[len(jitter) // 2]:.2f}ms"
+        f" p95={jitter[int(len(jitter) * 0.95)]:.2f}ms"
+        f" max={jitter[-1]:.2f}ms"
+    )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Measures the GUI frame time jitter while OCR runs in a thread "
+        "or in a separate process"
+    )
+    parser.add_argument("--real", action="store_true", help="Use the MangaOCR model")
+    args = parser.parse_args()
+
+    app = QApplication(sys.argv)
+
+    if args.real:
+        name, options = "manga_ocr", {}
+    else:
+        # Spends 30 ms per image in Python with the GIL held, like the model
+        name, options = "stub", {"latencyMs": 0, "perImageMs": 30, "busy": True}
+    thread = MicroBatcher(createEngine(name, **options))
+    process = ProcessBatcher(partial(loadEngine, name, 1, **options))
+
+    print("Jitter of a 16 ms timer, as the deviation from 16 ms")
+    for mode, batcher in [("idle", None), ("thread", thread), ("process", process)]:
+        report(mode, measure(batcher))
+    thread.close()
+    process.close()
@@ -0,0 +1,55 @@
+"""
+Cloe Import Time Check
+
+Copyright (C) `2021-2022` `<Alarcon Ace Belen>`
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <http://www.gnu.org/licenses/>.
+"""
+
+import argparse
+import sys
+from time import perf_counter
+
+HEAVY_MODULES = ("torch", "transformers", "manga_ocr")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Fails if starting the tray pulls in the OCR model libraries, or "
+        "importing the app takes longer than the budget"
+    )
+    parser.add_argument("--budget", type=float, default=1.5, help="Seconds allowed")
+    args = parser.parse_args()
+
+    start = perf_counter()
+    import main
+
+    elapsed = perf_counter() - start
+    print(f"import main: {elapsed:.3f}s (budget {args.budget:.3f}s)")
+
+    # The tray itself must not load the model libraries either, only loadModel does
+    from PyQt5.QtWidgets import QApplication
+
+    app = QApplication(sys.argv)
+    tray = main.SystemTray()
+
+    failures = []
+    heavy = [name for name in HEAVY_MODULES if name in sys.modules]
+    if heavy:
+        failures.append(f"imported {', '.join(heavy)} before the model is loaded")
+    if elapsed > args.budget:
+        failures.append(f"import main took {elapsed:.3f}s, over {args.budget:.3f}s")
+    if failures:
+        sys.exit("FAIL: " + "; ".join(failures))
+    print("OK: no model library imported")
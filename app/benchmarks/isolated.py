@@ -0,0 +1,111 @@
+"""
+Cloe Benchmarks
+
+Copyright (C) `2021-2022` `<Alarcon Ace Belen>`
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <http://www.gnu.org/licenses/>.
+"""
+
+import gc
+import json
+import os
+import subprocess
+import sys
+from time import perf_counter
+from typing import Optional
+
+from PIL import Image
+
+from cli import findImages
+from utils.ocr import BaseEngine
+
+
+def defaultFixtures(fixtures: Optional[str]) -> str:
+    """
+    Returns the fixtures directory, defaulting to the examples shipped with manga_ocr
+    """
+    if fixtures is not None:
+        return fixtures
+    import manga_ocr
+
+    return os.path.join(os.path.dirname(manga_ocr.__file__), "assets")
+
+
+def measureEngine(engine: BaseEngine, fixtures: str) -> dict:
+    """
+    Converts every fixture after a first unmeasured one, returning the texts, the
+    mean latency and the memory usage of the engine
+    """
+    gc.collect()
+    images = [Image.open(os.path.join(fixtures, p)) for p in findImages(fixtures)]
+    engine.ocr(images[0])
+
+    texts, times = [], []
+    for image in images:
+        start = perf_counter()
+        texts.append(engine.ocr(image))
+        times.append((perf_counter() - start) * 1000)
+
+    result = {"meanMs": sum(times) / len(times), "texts": texts}
+    result.update(engine.memoryUsage())
+    return result
+
+
+def runIsolated(
+    module: str, option: str, modes: list[str], fixtures: str
+) -> dict[str, dict]:
+    """Runs the benchmark module once per mode, each in a separate process so that
+    memory is comparable
+
+    Args:
+        module (str): Benchmark module, which prints its results for one mode as
+        a JSON line.
+        option (str): Option selecting the mode, such as "--mode".
+        modes (list[str]): Modes to run.
+        fixtures (str): Directory of images.
+
+    Returns:
+        dict[str, dict]: Results of each mode that ran, failed modes are reported
+        and left out.
+    """
+    results = {}
+    for mode in modes:
+        output = subprocess.run(
+            [sys.executable, "-m", module, option, mode, "--fixtures", fixtures],
+            capture_output=True,
+            text=True,
+        )
+        if output.returncode != 0:
+            errors = output.stderr.strip().splitlines() or ["failed"]
+            print(f"{mode}: {errors[-1]}")
+            continue
+        results[mode] = json.loads(output.stdout.strip().splitlines()[-1])
+    return results
+
+
+def editDistance(a: str, b: str) -> int:
+    previous = list(range(len(b) + 1))
+    for i, ca in enumerate(a, 1):
+        current = [i]
+        for j, cb in enumerate(b, 1):
+            current.append(
+                min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + (ca != cb))
+            )
+        previous = current
+    return previous[-1]
+
+
+def characterErrorRate(texts: list[str], references: list[str]) -> float:
+    errors = sum(editDistance(t, r) for t, r in zip(texts, references))
+    return errors / max(sum(len(r) for r in references), 1)
@@ -0,0 +1,256 @@
+"""
+Cloe Benchmarks
+
+Copyright (C) `2021-2022` `<Alarcon Ace Belen>`
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <http://www.gnu.org/licenses/>.
+"""
+
+import argparse
+import json
+import platform
+import sys
+from threading import Thread
+from time import perf_counter
+from typing import Callable, Optional
+
+from PyQt5.QtCore import QEvent, QEventLoop, QObject, QPoint, Qt
+from PyQt5.QtGui import QFont, QMouseEvent, QPainter, QPixmap
+from PyQt5.QtWidgets import QApplication, QWidget
+
+from components.windows import SystemTray
+from components.windows.external import ExternalWindow
+from utils.constants import APP_VERSION, OCR_DEFAULT, STYLESHEET_DEFAULT
+from utils.ocr import ENGINES, MicroBatcher, createEngine, engineOptions
+
+TIMEOUT_MS = 10000
+DRAG_STEPS = 10
+
+
+class PaintProbe(QObject):
+    """
+    Records when a widget of the overlay is first painted
+    """
+
+    def __init__(self):
+        super().__init__()
+        self.painted: Optional[float] = None
+
+    def eventFilter(self, obj: QObject, event: QEvent) -> bool:
+        if (
+            self.painted is None
+            and event.type() == QEvent.Paint
+            and isinstance(obj, QWidget)
+            and isinstance(obj.window(), ExternalWindow)
+        ):
+            self.painted = perf_counter()
+        return False
+
+
+def createPage(width: int, height: int) -> QPixmap:
+    """
+    Draws a page of vertical Japanese text to snip from
+    """
+    page = QPixmap(width, height)
+    page.fill(Qt.white)
+    painter = QPainter(page)
+    font = QFont()
+    font.setPixelSize(24)
+    painter.setFont(font)
+    text = "あいうえおかきくけこさしすせそたちつてと"
+    for column, x in enumerate(range(width - 60, 40, -40)):
+        for row, y in enumerate(range(60, height - 40, 30)):
+            painter.drawText(x, y, text[(column * 7 + row) % len(text)])
+    painter.end()
+    return page
+
+
+def waitUntil(done: Callable[[], bool], timeout=TIMEOUT_MS) -> bool:
+    """
+    Runs the event loop until done returns True, or until the timeout in ms
+    """
+    end = perf_counter() + timeout / 1000
+    app = QApplication.instance()
+    while not done():
+        if perf_counter() > end:
+            return False
+        app.processEvents(QEventLoop.AllEvents, 5)
+    return True
+
+
+def sendMouse(widget: QWidget, kind: QEvent.Type, pos: QPoint, buttons):
+    button = Qt.NoButton if kind == QEvent.MouseMove else Qt.LeftButton
+    QApplication.sendEvent(
+        widget, QMouseEvent(kind, pos, button, buttons, Qt.NoModifier)
+    )
+
+
+def percentiles(samples: list[float]) -> dict:
+    samples = sorted(samples)
+    if not samples:
+        return {"count": 0}
+    at = lambda q: samples[min(int(len(samples) * q), len(samples) - 1)]
+    return {
+        "count": len(samples),
+        "p50": round(at(0.5), 2),
+        "p95": round(at(0.95), 2),
+        "p99": round(at(0.99), 2),
+        "max": round(samples[-1], 2),
+    }
+
+
+def runOnce(
+    tray: SystemTray,
+    probe: PaintProbe,
+    page: QPixmap,
+    index: int,
+    moveBeforeRelease=False,
+) -> Optional[dict[str, float]]:
+    """Drives one snip: hotkey, drag, pause until the preview, then release
+
+    Args:
+        page (QPixmap): Page shown as the frozen screen.
+        index (int): Number of the snip, to vary the selected region.
+        moveBeforeRelease (bool, optional): Moves the cursor after the preview, so
+        that the release runs OCR again instead of reusing the preview.
+
+    Returns the latencies in ms, or None if a step timed out.
+    """
+    result = {}
+
+    # The hotkey listener emits from its own thread
+    probe.painted = None
+    start = perf_counter()
+    Thread(target=tray.hotkeys.onPress, args=(tray, "startCapture")).start()
+    if not waitUntil(lambda: probe.painted is not None):
+        return None
+    result["hotkeyToOverlay"] = (probe.painted - start) * 1000
+
+    view = tray.externalWindow.centralWidget()
+    viewport = view.viewport()
+    # Snips a page of text, since offscreen or Xvfb screens are blank
+    view.setFrame(page)
+    shown: list[float] = []
+    view.scheduler.result.connect(lambda *_: shown.append(perf_counter()))
+    streamed: list[float] = []
+    view.scheduler.progress.connect(lambda *_: streamed.append(perf_counter()))
+
+    # Each snip selects a different region so that previews do not repeat
+    origin = QPoint(40 + 7 * (index % 20), 40 + 5 * (index % 20))
+    size = QPoint(120 + 3 * (index % 10), 200)
+    sendMouse(viewport, QEvent.MouseButtonPress, origin, Qt.LeftButton)
+    for step in range(1, DRAG_STEPS + 1):
+        pos = origin + size * step / DRAG_STEPS
+        sendMouse(viewport, QEvent.MouseMove, pos, Qt.LeftButton)
+    start = perf_counter()
+    if not waitUntil(lambda: bool(shown)):
+        return None
+    # Includes the pause the view waits for before running OCR
+    result["pauseToPreview"] = (shown[0] - start) * 1000
+    # Cached previews are shown at once, without partial text
+    firstCharacter = min(streamed[:1] + shown[:1])
+    result["pauseToFirstCharacter"] = (firstCharacter - start) * 1000
+
+    if moveBeforeRelease:
+        size += QPoint(8, 8)
+        sendMouse(viewport, QEvent.MouseMove, origin + size, Qt.LeftButton)
+
+    clipboard = QApplication.clipboard()
+    clipboard.setText("")
+    written: list[float] = []
+    clipboard.dataChanged.connect(lambda: written.append(perf_counter()))
+    start = perf_counter()
+    sendMouse(viewport, QEvent.MouseButtonRelease, origin + size, Qt.NoButton)
+    done = waitUntil(lambda: bool(written))
+    clipboard.dataChanged.disconnect()
+    if not done:
+        return None
+    result["releaseToClipboard"] = (written[0] - start) * 1000
+
+    # Lets the overlay close before the next hotkey
+    waitUntil(lambda: tray.externalWindow is None)
+    return result
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Measures the latency of the snip to clipboard pipeline, driving "
+        "the overlay with synthetic mouse events. Run it with QT_QPA_PLATFORM="
+        "offscreen or under Xvfb."
+    )
+    parser.add_argument(
+        "--engine", choices=list(ENGINES), default="stub", help="OCR engine"
+    )
+    parser.add_argument("--iterations", type=int, default=30, help="Snips to run")
+    parser.add_argument(
+        "--cache", action="store_true", help="Keep the OCR cache enabled"
+    )
+    parser.add_argument(
+        "--move-before-release",
+        action="store_true",
+        help="Move after the preview, so that the release runs OCR again",
+    )
+    parser.add_argument("-o", "--output", help="JSON file. Defaults to stdout.")
+    args = parser.parse_args()
+
+    app = QApplication(sys.argv)
+    app.setQuitOnLastWindowClosed(False)
+    with open(STYLESHEET_DEFAULT, "r") as fh:
+        app.setStyleSheet(fh.read())
+
+    tray = SystemTray()
+    if not args.cache:
+        tray.executor.cache = None
+    engine = createEngine(args.engine, **engineOptions(args.engine, OCR_DEFAULT))
+    engine.warmup(OCR_DEFAULT["warmupIterations"])
+    tray.executor.model = MicroBatcher(engine, OCR_DEFAULT["batchSize"])
+
+    page = createPage(1200, 900)
+    probe = PaintProbe()
+    app.installEventFilter(probe)
+
+    samples: dict[str, list[float]] = {
+        "hotkeyToOverlay": [],
+        "pauseToFirstCharacter": [],
+        "pauseToPreview": [],
+        "releaseToClipboard": [],
+    }
+    failures = 0
+    for i in range(args.iterations):
+        result = runOnce(tray, probe, page, i, args.move_before_release)
+        if result is None:
+            failures += 1
+            if tray.externalWindow is not None:
+                tray.externalWindow.close()
+            continue
+        for name, value in result.items():
+            samples[name].append(value)
+
+    report = {
+        "version": APP_VERSION,
+        "engine": args.engine,
+        "platform": QApplication.platformName(),
+        "python": platform.python_version(),
+        "iterations": args.iterations,
+        "failures": failures,
+        "cache": args.cache,
+        "moveBeforeRelease": args.move_before_release,
+        "latencyMs": {name: percentiles(values) for name, values in samples.items()},
+    }
+    text = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as fh:
+            fh.write(text + "\n")
+    else:
+        print(text)
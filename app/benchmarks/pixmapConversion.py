@@ -0,0 +1,85 @@
+"""
+Cloe Pixmap Conversion Benchmark
+
+Copyright (C) `2021-2022` `<Alarcon Ace Belen>`
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <http://www.gnu.org/licenses/>.
+"""
+
+import sys
+from io import BytesIO
+from time import perf_counter
+
+import numpy as np
+from PIL import Image
+from PyQt5.QtCore import QBuffer
+from PyQt5.QtGui import QGuiApplication, QImage, QPixmap
+
+from utils.scripts import pixmapToArray, pixmapToImage
+
+SIZES = [(64, 256), (256, 256), (512, 512), (1280, 720), (1920, 1080), (3840, 2160)]
+REPEATS = 10
+
+
+def pngToImage(pixmap: QPixmap) -> Image.Image:
+    """
+    Previous conversion path of pixmapToText, kept as the baseline
+    """
+    buffer = QBuffer()
+    buffer.open(QBuffer.ReadWrite)
+    pixmap.save(buffer, "PNG")
+    image = Image.open(BytesIO(buffer.data()))
+    image.load()
+    return image
+
+
+def createPixmap(width: int, height: int) -> QPixmap:
+    """
+    Creates a pixmap filled with screen-like content (flat areas and noise)
+    """
+    rng = np.random.default_rng(0)
+    pixels = np.full((height, width, 4), 255, dtype=np.uint8)
+    noise = rng.integers(0, 256, (height, width // 2, 4), dtype=np.uint8)
+    pixels[:, : width // 2] = noise
+    image = QImage(pixels.data, width, height, width * 4, QImage.Format_RGB32)
+    return QPixmap.fromImage(image.copy())
+
+
+def measure(fn, pixmap: QPixmap) -> float:
+    """
+    Returns the median time in milliseconds of fn(pixmap)
+    """
+    times = []
+    for _ in range(REPEATS):
+        start = perf_counter()
+        fn(pixmap)
+        times.append((perf_counter() - start) * 1000)
+    return sorted(times)[len(times) // 2]
+
+
+if __name__ == "__main__":
+    app = QGuiApplication(sys.argv)
+
+    print(
+        f"{'size':>12} {'png (ms)':>10} {'image (ms)':>11} {'array (ms)':>11} {'speedup':>8}"
+    )
+    for width, height in SIZES:
+        pixmap = createPixmap(width, height)
+        png = measure(pngToImage, pixmap)
+        image = measure(pixmapToImage, pixmap)
+        array = measure(pixmapToArray, pixmap)
+        print(
+            f"{width:>5}x{height:<6} {png:>10.2f} {image:>11.2f} {array:>11.2f}"
+            f" {png / image:>7.1f}x"
+        )
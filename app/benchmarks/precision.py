@@ -0,0 +1,72 @@
+"""
+Cloe Benchmarks
+
+Copyright (C) `2021-2022` `<Alarcon Ace Belen>`
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <http://www.gnu.org/licenses/>.
+"""
+
+import argparse
+import json
+import sys
+
+from benchmarks.isolated import (
+    characterErrorRate,
+    defaultFixtures,
+    measureEngine,
+    runIsolated,
+)
+from cli import findImages
+from utils.ocr import createEngine
+
+MODES = ("fp32", "int8", "bf16")
+
+
+def run(mode: str, fixtures: str):
+    """
+    Measures one precision in isolation and prints its results as JSON
+    """
+    engine = createEngine("manga_ocr", precision=mode)
+    result = {"precision": engine.precision, **measureEngine(engine, fixtures)}
+    print(json.dumps(result, ensure_ascii=False))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Compares the latency, memory and character error rate of the "
+        "model precisions, against fp32"
+    )
+    parser.add_argument(
+        "--fixtures",
+        help="Directory of images. Defaults to the examples shipped with manga_ocr.",
+    )
+    parser.add_argument("--mode", choices=MODES, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    args.fixtures = defaultFixtures(args.fixtures)
+
+    if args.mode:
+        run(args.mode, args.fixtures)
+        sys.exit()
+
+    results = runIsolated("benchmarks.precision", "--mode", MODES, args.fixtures)
+
+    print(f"{len(findImages(args.fixtures))} fixtures in {args.fixtures}")
+    print(f"{'mode':>5} {'used':>5} {'latency (ms)':>13} {'RSS (MB)':>9} {'CER':>6}")
+    references = results.get("fp32", {}).get("texts", [])
+    for mode, result in results.items():
+        cer = characterErrorRate(result["texts"], references)
+        print(
+            f"{mode:>5} {result['precision']:>5} {result['meanMs']:>13.1f}"
+            f" {result['residentMB']:>9.1f} {cer:>6.3f}"
+        )
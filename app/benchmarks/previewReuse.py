@@ -0,0 +1,130 @@
+"""
+Cloe Benchmarks
+
+Copyright (C) `2021-2022` `<Alarcon Ace Belen>`
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <http://www.gnu.org/licenses/>.
+"""
+
+import argparse
+import json
+import random
+import sys
+
+from PyQt5.QtCore import QEvent, QPoint, Qt
+from PyQt5.QtGui import QPixmap
+from PyQt5.QtTest import QTest
+from PyQt5.QtWidgets import QApplication
+
+from benchmarks.pipeline import createPage, sendMouse
+from components.windows import SystemTray
+from utils.ocr import MicroBatcher, PreviewPolicy, StubEngine
+
+# Mouse samples per second while dragging
+SAMPLE_RATE = 60
+
+
+def createSession(seed: int, drags: int) -> list[list[tuple[int, QPoint]]]:
+    """Creates drags that move like a hand: towards a target, overshooting, then
+    resting on it with a pixel or two of tremor and a few pauses
+
+    Returns, per drag, the delay in ms before each mouse position. The first
+    position is the press and the last one the release.
+    """
+    rng = random.Random(seed)
+    step = 1000 // SAMPLE_RATE
+    session = []
+    for _ in range(drags):
+        start = QPoint(rng.randint(100, 600), rng.randint(100, 300))
+        target = start + QPoint(rng.randint(60, 200), rng.randint(150, 500))
+        events = [(0, start)]
+        position = start
+
+        # Overshoots the target, then comes back to it
+        for goal in [target + QPoint(rng.randint(5, 30), rng.randint(5, 40)), target]:
+            for i in range(1, 16):
+                events.append((step, position + (goal - position) * i / 15))
+            position = goal
+
+        # Rests on the target, pausing long enough for previews now and then
+        for _ in range(rng.randint(20, 60)):
+            tremor = QPoint(rng.randint(-2, 2), rng.randint(-2, 2))
+            delay = rng.choice([step] * 12 + [350, 600])
+            events.append((delay, target + tremor))
+        session.append(events)
+    return session
+
+
+def replay(tray: SystemTray, page: QPixmap, session) -> dict[str, int]:
+    """Replays the drags over the page on the clock of the session, returning the
+    previews that ran the model and those that reused the last one
+
+    The preview timer is not used, it fires wherever the session pauses for the
+    interval, so the counts do not depend on how fast the machine is.
+    """
+    totals = {"previews": 0, "previewsRun": 0, "previewsReused": 0}
+    for events in session:
+        tray.startCapture()
+        view = tray.externalWindow.centralWidget()
+        view.setFrame(page)
+        viewport = view.viewport()
+        interval = view.previewPolicy.interval()
+
+        sendMouse(viewport, QEvent.MouseButtonPress, events[0][1], Qt.LeftButton)
+        moves = events[1:-1]
+        for i, (delay, position) in enumerate(moves):
+            sendMouse(viewport, QEvent.MouseMove, position, Qt.LeftButton)
+            # The selection rests for the interval before the next move or release
+            if i + 1 == len(moves) or moves[i + 1][0] >= interval:
+                view.previewTimeout()
+                totals["previews"] += 1
+
+        totals["previewsRun"] += view.previewsRun
+        totals["previewsReused"] += view.previewsReused
+        sendMouse(viewport, QEvent.MouseButtonRelease, events[-1][1], Qt.NoButton)
+        # Lets the previews and the final OCR finish before the next drag
+        QTest.qWait(100)
+    return totals
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Counts the preview inferences saved by reusing the last preview "
+        "while the selection only jitters, over replayed drags"
+    )
+    parser.add_argument("--drags", type=int, default=10, help="Drags to replay")
+    parser.add_argument("--seed", type=int, default=0, help="Seed of the drags")
+    args = parser.parse_args()
+
+    app = QApplication(sys.argv)
+    app.setQuitOnLastWindowClosed(False)
+    tray = SystemTray()
+    tray.executor.cache = None
+    # A fixed interval, which decides where the session fires previews
+    tray.executor.previewPolicy = PreviewPolicy(minInterval=300, maxInterval=300)
+    tray.executor.model = MicroBatcher(StubEngine(latencyMs=20, perImageMs=10))
+
+    page = createPage(1200, 900)
+    session = createSession(args.seed, args.drags)
+    totals = replay(tray, page, session)
+    # Without reuse, every preview would have run the model
+    saved = totals["previewsReused"]
+    report = {
+        "drags": args.drags,
+        "seed": args.seed,
+        **totals,
+        "inferencesSaved": saved,
+        "savedRatio": round(saved / max(totals["previews"], 1), 3),
+    }
+    print(json.dumps(report, indent=2))
@@ -0,0 +1,107 @@
+"""
+Cloe Benchmarks
+
+Copyright (C) `2021-2022` `<Alarcon Ace Belen>`
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <http://www.gnu.org/licenses/>.
+"""
+
+import argparse
+import json
+import os
+import signal
+import sys
+import tempfile
+from functools import partial
+from time import perf_counter, sleep
+
+from utils.ocr import ProcessBatcher, loadEngine
+from utils.ocr.batching import BatchRunner
+from utils.ocr.warmup import syntheticImage
+
+# Seconds to wait for the OCR process to come back
+RECOVERY_TIMEOUT = 120.0
+
+
+def loadUnlessBlocked(marker: str) -> BatchRunner:
+    """
+    Loads the stub engine, failing while the marker file exists
+    """
+    if os.path.exists(marker):
+        raise RuntimeError("The model is blocked by the benchmark")
+    return loadEngine("stub", 0, latencyMs=10, perImageMs=0)
+
+
+def killProcess(batcher: ProcessBatcher):
+    os.kill(batcher.process.pid(), getattr(signal, "SIGKILL", signal.SIGTERM))
+
+
+def recover(batcher: ProcessBatcher, image) -> tuple[float, int]:
+    """
+    Returns the seconds until a batch succeeds again and the failed batches before
+    """
+    start = perf_counter()
+    failures = 0
+    while perf_counter() - start < RECOVERY_TIMEOUT:
+        try:
+            batcher.ocr(image)
+            return perf_counter() - start, failures
+        except RuntimeError:
+            failures += 1
+            sleep(0.1)
+    raise TimeoutError(f"No recovery within {RECOVERY_TIMEOUT} s")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Kills the OCR process twice, then once with its restart failing, "
+        "and fails unless OCR recovers each time"
+    )
+    parser.parse_args()
+
+    image = syntheticImage((64, 200))
+    marker = os.path.join(tempfile.mkdtemp(), "blocked")
+    batcher = ProcessBatcher(partial(loadUnlessBlocked, marker))
+    batcher.ocr(image)
+
+    report = {}
+    try:
+        for kill in ("firstKill", "secondKill"):
+            killProcess(batcher)
+            seconds, failures = recover(batcher, image)
+            report[kill] = {"recoveryS": round(seconds, 2), "failedBatches": failures}
+
+        # The restart after this kill fails, the next batches retry with backoff
+        open(marker, "w").close()
+        killProcess(batcher)
+        # Until the batches raise the error of the failed restart
+        error = ""
+        while "blocked" not in error:
+            try:
+                batcher.ocr(image)
+            except RuntimeError as e:
+                error = str(e)
+        os.remove(marker)
+        seconds, failures = recover(batcher, image)
+        report["failedRestart"] = {
+            "recoveryS": round(seconds, 2),
+            "failedBatches": failures,
+        }
+    except TimeoutError as e:
+        sys.exit(f"FAIL: {e}, after {json.dumps(report)}")
+    finally:
+        batcher.close()
+
+    report["restarts"] = batcher.process.restarts
+    print(json.dumps(report, indent=2))
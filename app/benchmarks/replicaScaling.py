@@ -0,0 +1,89 @@
+"""
+Cloe Benchmarks
+
+Copyright (C) `2021-2022` `<Alarcon Ace Belen>`
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <http://www.gnu.org/licenses/>.
+"""
+
+import argparse
+import os
+from concurrent.futures import ThreadPoolExecutor
+from time import perf_counter
+
+from utils.constants import OCR_DEFAULT
+from utils.ocr import ENGINES, BaseEngine, ReplicaPool, createEngine, engineOptions
+from utils.ocr.warmup import syntheticImage
+
+BATCH_SIZE = 4
+
+
+def proportionalKB(pid: int) -> int:
+    """
+    Returns the proportional set size of the process, counting shared pages once
+    across the processes sharing them. Only available on Linux.
+    """
+    try:
+        with open(f"/proc/{pid}/smaps_rollup", "r") as fh:
+            for line in fh:
+                if line.startswith("Pss:"):
+                    return int(line.split()[1])
+    except OSError:
+        pass
+    return 0
+
+
+def measure(engine: BaseEngine, workers: int, count: int) -> tuple[float, int]:
+    """
+    Returns the throughput in images/s and the total memory in KB of the pool
+    """
+    pool = ReplicaPool(engine, workers, warmupIterations=1, maxBatch=BATCH_SIZE)
+    images = [syntheticImage((48 + i % 32, 240)) for i in range(count)]
+    batches = [images[i : i + BATCH_SIZE] for i in range(0, count, BATCH_SIZE)]
+
+    start = perf_counter()
+    with ThreadPoolExecutor(workers) as executor:
+        list(executor.map(pool.ocrBatch, batches))
+    elapsed = perf_counter() - start
+
+    pids = [os.getpid()] + [r._process.pid for r in pool.replicas]
+    memory = sum(proportionalKB(pid) for pid in pids)
+    pool.close()
+    return count / elapsed, memory
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Measures the throughput of the model replica pool"
+    )
+    parser.add_argument("--images", type=int, default=64, help="Images per run")
+    parser.add_argument(
+        "--workers", type=int, nargs="+", default=[1, 2, 4, 8], help="Pool sizes"
+    )
+    parser.add_argument(
+        "--engine", choices=list(ENGINES), default="manga_ocr", help="OCR engine"
+    )
+    args = parser.parse_args()
+
+    engine = createEngine(args.engine, **engineOptions(args.engine, OCR_DEFAULT))
+    print(f"{os.cpu_count()} cores")
+    print(f"{'workers':>7} {'images/s':>9} {'speedup':>8} {'memory (MB)':>12}")
+    baseline = None
+    for workers in args.workers:
+        throughput, memory = measure(engine, workers, args.images)
+        baseline = baseline or throughput
+        print(
+            f"{workers:>7} {throughput:>9.2f} {throughput / baseline:>8.2f}"
+            f" {memory / 1024:>12.1f}"
+        )
@@ -0,0 +1,128 @@
+"""
+Cloe Screen Capture Benchmark
+
+Copyright (C) `2021-2022` `<Alarcon Ace Belen>`
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <http://www.gnu.org/licenses/>.
+"""
+
+import subprocess
+import sys
+from time import perf_counter
+
+from PyQt5.QtCore import QRect
+from PyQt5.QtWidgets import QApplication, QWidget
+
+TICKS = 50
+SELECTION = QRect(100, 100, 300, 400)
+
+
+def fullCapture(index: int, rect: QRect):
+    """
+    Previous capture path: grab and rescale the whole screen, then crop it
+    """
+    screen = QApplication.screens()[index]
+    s = screen.size()
+    pixmap = screen.grabWindow(0, 0, 0, s.width(), s.height())
+    return pixmap.scaled(s.width(), s.height()).copy(rect)
+
+
+def regionCapture(index: int, rect: QRect):
+    """
+    Current capture path: grab only the selected region
+    """
+    screen = QApplication.screens()[index]
+    return screen.grabWindow(0, rect.x(), rect.y(), rect.width(), rect.height())
+
+
+def maxResidentKB() -> int:
+    """
+    Returns the peak resident memory of the process in KB, or 0 where it is unknown
+    """
+    if sys.platform == "win32":
+        import ctypes
+        from ctypes import wintypes
+
+        class MemoryCounters(ctypes.Structure):
+            _fields_ = [
+                ("cb", wintypes.DWORD),
+                ("PageFaultCount", wintypes.DWORD),
+                ("PeakWorkingSetSize", ctypes.c_size_t),
+                ("WorkingSetSize", ctypes.c_size_t),
+                ("QuotaPeakPagedPoolUsage", ctypes.c_size_t),
+                ("QuotaPagedPoolUsage", ctypes.c_size_t),
+                ("QuotaPeakNonPagedPoolUsage", ctypes.c_size_t),
+                ("QuotaNonPagedPoolUsage", ctypes.c_size_t),
+                ("PagefileUsage", ctypes.c_size_t),
+                ("PeakPagefileUsage", ctypes.c_size_t),
+            ]
+
+        counters = MemoryCounters()
+        counters.cb = ctypes.sizeof(counters)
+        process = ctypes.windll.kernel32.GetCurrentProcess()
+        if not ctypes.windll.psapi.GetProcessMemoryInfo(
+            process, ctypes.byref(counters), counters.cb
+        ):
+            return 0
+        return counters.PeakWorkingSetSize // 1024
+
+    # Not available on Windows, so only imported here
+    try:
+        import resource
+    except ImportError:
+        return 0
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Reported in bytes on macOS
+    return peak // 1024 if sys.platform == "darwin" else peak
+
+
+def run(mode: str):
+    """
+    Measures one capture mode in isolation and prints its results
+    """
+    app = QApplication(sys.argv)
+    # Some platforms only allow grabbing the screen if a window is shown
+    window = QWidget()
+    window.showFullScreen()
+    app.processEvents()
+
+    capture = fullCapture if mode == "full" else regionCapture
+    # Some platforms compose their screen image on the first grab, whatever its size
+    regionCapture(0, QRect(0, 0, 1, 1))
+    baseline = maxResidentKB()
+
+    times = []
+    for _ in range(TICKS):
+        start = perf_counter()
+        capture(0, SELECTION)
+        times.append((perf_counter() - start) * 1000)
+    times.sort()
+
+    size = QApplication.screens()[0].size()
+    print(
+        f"{mode:>7} {size.width()}x{size.height()}"
+        f" p50={times[len(times) // 2]:.2f}ms p95={times[int(len(times) * 0.95)]:.2f}ms"
+        f" peak+={maxResidentKB() - baseline}KB"
+    )
+
+
+if __name__ == "__main__":
+    if len(sys.argv) > 1:
+        run(sys.argv[1])
+    else:
+        # Each mode runs in a separate process so that peak memory is comparable.
+        # Without a large monitor, QT_QPA_PLATFORM=vnc:size=3840x2160 measures a
+        # 4K screen on Linux.
+        for mode in ("full", "region"):
+            subprocess.run([sys.executable, "-m", "benchmarks.screenCapture", mode])
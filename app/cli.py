@@ -0,0 +1,210 @@
+"""
+Cloe Batch OCR
+
+Copyright (C) `2021-2022` `<Alarcon Ace Belen>`
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <http://www.gnu.org/licenses/>.
+"""
+
+import argparse
+import json
+import os
+import sys
+from queue import Empty, Queue
+from threading import Lock, Thread
+from time import perf_counter
+from typing import IO, Union
+
+from PIL import Image
+
+from utils.constants import OCR_DEFAULT
+from utils.ocr import ENGINES, BaseEngine, ReplicaPool, createEngine, engineOptions
+from utils.scripts import imagesToText
+
+IMAGE_EXTENSIONS = {".bmp", ".gif", ".jpeg", ".jpg", ".png", ".tif", ".tiff", ".webp"}
+
+
+def findImages(directory: str) -> list[str]:
+    """
+    Returns the paths of the images in the directory and its subdirectories,
+    relative to the directory and in a stable order
+    """
+    paths = []
+    for root, dirs, files in os.walk(directory):
+        dirs.sort()
+        for name in sorted(files):
+            if os.path.splitext(name)[1].lower() in IMAGE_EXTENSIONS:
+                paths.append(os.path.relpath(os.path.join(root, name), directory))
+    return paths
+
+
+def readDone(output: str) -> set[str]:
+    """
+    Returns the paths already converted in a previous run, for --resume
+    """
+    done = set()
+    if not os.path.exists(output):
+        return done
+    with open(output, "r", encoding="utf-8") as fh:
+        for line in fh:
+            try:
+                record = json.loads(line)
+            except ValueError:
+                # Last line of an interrupted run
+                continue
+            if "text" in record:
+                done.add(record["path"])
+    return done
+
+
+def endsWithNewline(path: str) -> bool:
+    with open(path, "rb") as fh:
+        if fh.seek(0, os.SEEK_END) == 0:
+            return True
+        fh.seek(-1, os.SEEK_END)
+        return fh.read(1) == b"\n"
+
+
+def convertBatches(
+    model: Union[BaseEngine, ReplicaPool],
+    directory: str,
+    batches: Queue,
+    output: IO,
+    lock: Lock,
+):
+    """
+    Converts batches of paths until the queue is empty, writing a record per image
+    """
+    while True:
+        try:
+            paths = batches.get_nowait()
+        except Empty:
+            return
+
+        images, records = [], []
+        for path in paths:
+            try:
+                with Image.open(os.path.join(directory, path)) as image:
+                    images.append(image.convert("RGB"))
+                records.append({"path": path})
+            except OSError as e:
+                with lock:
+                    output.write(json.dumps({"path": path, "error": str(e)}) + "\n")
+
+        start = perf_counter()
+        try:
+            texts = imagesToText(images, model)
+        except Exception as e:
+            texts = None
+            error = str(e)
+        ms = 1000 * (perf_counter() - start) / max(len(images), 1)
+
+        with lock:
+            for i, record in enumerate(records):
+                if texts is None:
+                    record["error"] = error
+                else:
+                    record["text"] = texts[i]
+                    record["ms"] = round(ms, 1)
+                output.write(json.dumps(record, ensure_ascii=False) + "\n")
+            output.flush()
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Converts a directory of images to text with an OCR "
+        "engine, writing one JSON line per image as soon as it is done"
+    )
+    parser.add_argument("directory", help="Directory of crops or pages")
+    parser.add_argument("-o", "--output", help="JSONL file. Defaults to stdout.")
+    parser.add_argument(
+        "--resume", action="store_true", help="Skip images already in the output"
+    )
+    parser.add_argument(
+        "--workers", type=int, default=1, help="Number of model replicas"
+    )
+    parser.add_argument("--batch-size", type=int, default=8, help="Images per batch")
+    parser.add_argument(
+        "--engine",
+        choices=list(ENGINES),
+        default="manga_ocr",
+        help="OCR engine, stub needs no model",
+    )
+    parser.add_argument(
+        "--precision",
+        choices=["fp32", "int8", "bf16"],
+        default="fp32",
+        help="Precision of the model on the CPU",
+    )
+    args = parser.parse_args()
+
+    if args.resume and not args.output:
+        parser.error("--resume needs --output")
+
+    paths = findImages(args.directory)
+    if args.resume:
+        done = readDone(args.output)
+        paths = [path for path in paths if path not in done]
+    if not paths:
+        print("Nothing to convert", file=sys.stderr)
+        return
+
+    start = perf_counter()
+    config = {**OCR_DEFAULT, "precision": args.precision}
+    model = createEngine(args.engine, **engineOptions(args.engine, config))
+    if args.workers > 1:
+        # Forked from this process, so the weights are only loaded once
+        model = ReplicaPool(
+            model, args.workers, warmupIterations=0, maxBatch=args.batch_size
+        )
+    print(f"Loaded the model in {perf_counter() - start:.1f} s", file=sys.stderr)
+
+    batches = Queue()
+    for i in range(0, len(paths), args.batch_size):
+        batches.put(paths[i : i + args.batch_size])
+
+    output = sys.stdout
+    if args.output:
+        output = open(args.output, "a", encoding="utf-8")
+        # Ends the last line of an interrupted run, so the next record is not lost
+        if not endsWithNewline(args.output):
+            output.write("\n")
+    lock = Lock()
+    start = perf_counter()
+    threads = [
+        Thread(
+            target=convertBatches,
+            args=(model, args.directory, batches, output, lock),
+        )
+        for _ in range(args.workers)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = perf_counter() - start
+
+    if output is not sys.stdout:
+        output.close()
+    if isinstance(model, ReplicaPool):
+        model.close()
+    print(
+        f"Converted {len(paths)} images in {elapsed:.1f} s"
+        f" ({len(paths) / elapsed:.2f} images/s)",
+        file=sys.stderr,
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -52,6 +52,10 @@ class RubberBand(QRubberBand):
     def setFill(self, color: QColor):
         self._fillColor = color
 
+    def copyStyle(self, other: "RubberBand"):
+        self.setBorder(other._borderColor, other._borderThickness)
+        self.setFill(other._fillColor)
+
     def paintEvent(self, event: QPaintEvent):
         painter = QPainter()
         painter.begin(self)
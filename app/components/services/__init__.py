@@ -18,4 +18,10 @@ along with this program.  If not, see <http://www.gnu.org/licenses/>.
 """
 
 from .hotkeys import Hotkeys
-from .workers import BaseWorker, BaseWorkerSignal
+from .server import OCRServer
+from .workers import (
+    BaseWorker,
+    BaseWorkerSignal,
+    InferenceExecutor,
+    LatestWinsScheduler,
+)
@@ -0,0 +1,231 @@
+"""
+Cloe OCR Service
+
+Copyright (C) `2021-2022` `<Alarcon Ace Belen>`
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <http://www.gnu.org/licenses/>.
+"""
+
+import base64
+import ipaddress
+import json
+from concurrent.futures import TimeoutError
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from io import BytesIO
+from threading import BoundedSemaphore, Event, Thread
+from time import perf_counter
+
+from PIL import Image
+
+from .workers import InferenceExecutor
+from utils.constants import APP_NAME, APP_VERSION
+from utils.scripts import imagesToText
+
+
+class OCRRequestHandler(BaseHTTPRequestHandler):
+    """Handles the requests of the local OCR service
+
+    GET /status returns whether the model is loaded and the executor stats.
+    POST /ocr takes either raw image bytes, or a JSON object with "images" as
+    a list of base64 encoded images and/or "paths" as a list of image files.
+    Only loopback clients may send paths. The images are converted in batches of
+    the model's maxBatch, each its own executor task so that the app's captures run
+    in between. The texts are returned in order with the time spent waiting for
+    the model and running it.
+    """
+
+    server: "OCRServer"
+    server_version = f"{APP_NAME}/{APP_VERSION}"
+
+    def do_GET(self):
+        if self.path != "/status":
+            self.sendJSON(404, {"error": "Not found"})
+            return
+        gate = self.server.executor.gate
+        self.sendJSON(
+            200,
+            {
+                "loaded": self.server.executor.model is not None,
+                "executor": self.server.executor.stats(),
+                "gate": gate.stats() if gate is not None else None,
+            },
+        )
+
+    def do_POST(self):
+        if self.path != "/ocr":
+            self.sendJSON(404, {"error": "Not found"})
+            return
+        try:
+            length = int(self.headers.get("Content-Length", 0))
+        except ValueError:
+            self.sendJSON(400, {"error": "Invalid Content-Length"})
+            return
+        # Refused before reading, the rest of the body is dropped with the connection
+        if length > self.server.maxBodySize:
+            self.close_connection = True
+            self.sendJSON(413, {"error": f"Body over {self.server.maxBodySize} bytes"})
+            return
+        try:
+            images = self.readImages(length)
+        except PermissionError as e:
+            self.sendJSON(403, {"error": str(e)})
+            return
+        except Exception as e:
+            self.sendJSON(400, {"error": f"Invalid request: {e}"})
+            return
+        if not images:
+            self.sendJSON(400, {"error": "No images given"})
+            return
+        if self.server.executor.model is None:
+            self.sendJSON(503, {"error": "The MangaOCR model is not yet loaded"})
+            return
+
+        # Requests over the limit are refused rather than queued behind the others
+        if not self.server.slots.acquire(blocking=False):
+            self.sendJSON(503, {"error": "Too many concurrent requests"})
+            return
+        try:
+            self.sendJSON(200, self.convertImages(images))
+        except TimeoutError:
+            self.sendJSON(504, {"error": "Timed out waiting for the model"})
+        except Exception as e:
+            self.sendJSON(500, {"error": str(e)})
+        finally:
+            self.server.slots.release()
+
+    def log_message(self, format, *args):
+        pass
+
+    # ------------------------------ Helper Functions ------------------------------- #
+
+    def readImages(self, length: int) -> list[Image.Image]:
+        body = self.rfile.read(length)
+        if self.headers.get_content_type() != "application/json":
+            return [Image.open(BytesIO(body)).convert("RGB")]
+
+        data = json.loads(body)
+        encoded = list(data.get("images", []))
+        paths = list(data.get("paths", []))
+        # Counted before decoding any of them
+        if len(encoded) + len(paths) > self.server.maxImages:
+            raise ValueError(f"more than {self.server.maxImages} images")
+        if paths and not self.isLoopbackClient():
+            raise PermissionError("Only local clients may send paths")
+
+        images = [
+            Image.open(BytesIO(base64.b64decode(image))).convert("RGB")
+            for image in encoded
+        ]
+        images += [Image.open(path).convert("RGB") for path in paths]
+        return images
+
+    def isLoopbackClient(self) -> bool:
+        return ipaddress.ip_address(self.client_address[0]).is_loopback
+
+    def convertImages(self, images: list[Image.Image]) -> dict:
+        executor = self.server.executor
+        model = executor.model
+        timing = {"queueMs": None, "inferenceMs": 0.0}
+        cancelEvent = Event()
+        submitted = perf_counter()
+
+        def convert(batch: list[Image.Image]) -> list[str]:
+            started = perf_counter()
+            if timing["queueMs"] is None:
+                timing["queueMs"] = 1000 * (started - submitted)
+            texts = imagesToText(
+                batch, model, executor.cache, executor.gate, cancelEvent
+            )
+            timing["inferenceMs"] += 1000 * (perf_counter() - started)
+            return texts
+
+        # Shares the model and its queue with the app, behind its captures
+        futures = [
+            executor.submit(
+                convert,
+                images[i : i + model.maxBatch],
+                priority=InferenceExecutor.BACKGROUND,
+            )
+            for i in range(0, len(images), model.maxBatch)
+        ]
+        deadline = submitted + self.server.modelTimeout
+        try:
+            texts = [
+                text
+                for future in futures
+                for text in future.result(max(deadline - perf_counter(), 0))
+            ]
+        except TimeoutError:
+            # Stops the running batch and drops those not yet started
+            cancelEvent.set()
+            for future in futures:
+                future.cancel()
+            raise
+        timing["totalMs"] = 1000 * (perf_counter() - submitted)
+        return {"texts": texts, "timing": timing}
+
+    def sendJSON(self, status: int, data: dict):
+        body = json.dumps(data, ensure_ascii=False).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+class OCRServer(ThreadingHTTPServer):
+    """Local HTTP service sharing the loaded model with other tools
+
+    Only binds to the loopback interface by default. Bound to another interface,
+    it still only reads image paths sent by loopback clients.
+
+    Args:
+        executor (InferenceExecutor): Executor owning the model.
+        host (str, optional): Address to bind to. Defaults to "127.0.0.1".
+        port (int, optional): Port to listen on. Defaults to 7331.
+        concurrency (int, optional): Maximum number of requests converted at once,
+        others are refused. Defaults to 4.
+        timeout (float, optional): Seconds to wait for the model. Defaults to 30.
+        maxImages (int, optional): Maximum number of images per request.
+        Defaults to 64.
+        maxBodySize (int, optional): Maximum size of a request body in bytes, larger
+        requests are refused before they are read. Defaults to 32 MB.
+    """
+
+    daemon_threads = True
+
+    def __init__(
+        self,
+        executor: InferenceExecutor,
+        host="127.0.0.1",
+        port=7331,
+        concurrency=4,
+        timeout=30.0,
+        maxImages=64,
+        maxBodySize=32 * 2**20,
+    ):
+        super().__init__((host, port), OCRRequestHandler)
+        self.executor = executor
+        self.slots = BoundedSemaphore(concurrency)
+        self.modelTimeout = timeout
+        self.maxImages = maxImages
+        self.maxBodySize = maxBodySize
+        self._thread = Thread(target=self.serve_forever, daemon=True)
+
+    def start(self):
+        self._thread.start()
+
+    def stop(self):
+        self.shutdown()
+        self.server_close()
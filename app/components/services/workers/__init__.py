@@ -18,3 +18,5 @@ along with this program.  If not, see <http://www.gnu.org/licenses/>.
 """
 
 from .base import BaseWorker, BaseWorkerSignal
+from .executor import InferenceExecutor
+from .scheduler import LatestWinsScheduler
@@ -17,11 +17,14 @@ You should have received a copy of the GNU General Public License
 along with this program.  If not, see <http://www.gnu.org/licenses/>.
 """
 
+from threading import Event
+from time import perf_counter
 from typing import Callable
 
 from PyQt5.QtCore import QRunnable, pyqtSlot
 
 from .signals import BaseWorkerSignal
+from utils.tracing import tracer
 
 
 class BaseWorker(QRunnable):
@@ -30,7 +33,9 @@ class BaseWorker(QRunnable):
     Args:
         fn (Callable): Long running task or function
 
-    *Note: args/kwargs passed onto the BaseWorker are passed onto fn
+    *Note: args/kwargs passed onto the BaseWorker are passed onto fn.
+    Pass a threading.Event as the cancelEvent kwarg to let fn observe cancel().
+    Pass onProgress=True to give fn a callback emitting the progress signal.
     """
 
     def __init__(self, fn: Callable, *args, **kwargs):
@@ -39,9 +44,37 @@ class BaseWorker(QRunnable):
         self.args = args
         self.kwargs = kwargs
         self.signals = BaseWorkerSignal()
+        self.cancelEvent: Event = kwargs.get("cancelEvent") or Event()
+        if kwargs.get("onProgress") is True:
+            self.kwargs["onProgress"] = self.signals.progress.emit
+        # Start of the queueWait span, up to when a pool thread runs the worker
+        self.created = perf_counter()
+
+    def cancel(self):
+        """
+        Requests the task to stop. The result of a cancelled task is never emitted.
+        """
+        self.cancelEvent.set()
+
+    def isCancelled(self) -> bool:
+        return self.cancelEvent.is_set()
 
     @pyqtSlot()
     def run(self):
-        output = self.fn(*self.args, **self.kwargs)
-        self.signals.result.emit(output)
-        self.signals.finished.emit()
+        if tracer.enabled:
+            tracer.add("queueWait", self.created, perf_counter())
+        try:
+            if self.isCancelled():
+                self.signals.cancelled.emit()
+                return
+            with tracer.span("worker"):
+                output = self.fn(*self.args, **self.kwargs)
+        except Exception as e:
+            self.signals.error.emit(e)
+        else:
+            if self.isCancelled():
+                self.signals.cancelled.emit()
+            else:
+                self.signals.result.emit(output)
+        finally:
+            self.signals.finished.emit()
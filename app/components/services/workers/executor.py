@@ -0,0 +1,128 @@
+"""
+Cloe Multithreaded Workers
+
+Copyright (C) `2021-2022` `<Alarcon Ace Belen>`
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <http://www.gnu.org/licenses/>.
+"""
+
+from concurrent.futures import Future
+from threading import Lock
+from time import perf_counter
+from typing import TYPE_CHECKING, Any, Callable, Optional
+
+from PyQt5.QtCore import QObject, QThreadPool
+
+from .base import BaseWorker
+
+if TYPE_CHECKING:
+    from utils.ocr import ContentGate, MicroBatcher, OCRCache, PreviewPolicy
+
+
+class InferenceExecutor(QThreadPool):
+    """Single thread that owns the OCR model and runs tasks by priority
+
+    Since every task using the model is started here, tasks reach the model one
+    at a time and higher priority tasks waiting to start run first. The tasks only
+    queue their images on the MicroBatcher and wait, the batcher thread runs the
+    model itself.
+
+    Args:
+        parent (QObject, optional): Parent object. Defaults to None.
+    """
+
+    # Priority classes, from lowest to highest
+    BACKGROUND = 0
+    PREVIEW = 1
+    FINAL = 2
+    PRIORITY_NAMES = {BACKGROUND: "background", PREVIEW: "preview", FINAL: "final"}
+
+    def __init__(self, parent: QObject = None):
+        super().__init__(parent)
+        self.setMaxThreadCount(1)
+
+        self.model: Optional["MicroBatcher"] = None
+        self.cache: Optional["OCRCache"] = None
+        self.gate: Optional["ContentGate"] = None
+        self.previewPolicy: Optional["PreviewPolicy"] = None
+
+        self._lock = Lock()
+        self._stats = {
+            p: {"count": 0, "wait": 0.0, "maxWait": 0.0, "service": 0.0}
+            for p in self.PRIORITY_NAMES
+        }
+
+    def start(self, worker: BaseWorker, priority=BACKGROUND):
+        """Queues the worker, recording how long it waited and ran
+
+        Args:
+            worker (BaseWorker): Worker to run.
+            priority (int, optional): Priority class of the worker.
+            Defaults to BACKGROUND.
+        """
+        fn, queued = worker.fn, perf_counter()
+
+        def timedFn(*args, **kwargs):
+            started = perf_counter()
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                self.record(priority, started - queued, perf_counter() - started)
+
+        worker.fn = timedFn
+        super().start(worker, priority)
+
+    def submit(self, fn: Callable, *args, priority=BACKGROUND, **kwargs) -> Future:
+        """Queues fn, returning a future for callers outside of the Qt event loop
+
+        Args:
+            fn (Callable): Task to run, with the args and kwargs.
+            priority (int, optional): Priority class of the task. Defaults to BACKGROUND.
+        """
+        future = Future()
+
+        def futureFn():
+            if not future.set_running_or_notify_cancel():
+                return
+            try:
+                future.set_result(fn(*args, **kwargs))
+            except Exception as e:
+                future.set_exception(e)
+
+        self.start(BaseWorker(futureFn), priority)
+        return future
+
+    def record(self, priority: int, wait: float, service: float):
+        with self._lock:
+            stats = self._stats[priority]
+            stats["count"] += 1
+            stats["wait"] += wait
+            stats["maxWait"] = max(stats["maxWait"], wait)
+            stats["service"] += service
+
+    def stats(self) -> dict[str, dict[str, Any]]:
+        """
+        Returns the mean/max queue wait and the mean service time in ms per priority class
+        """
+        report = {}
+        with self._lock:
+            for priority, stats in self._stats.items():
+                count = max(stats["count"], 1)
+                report[self.PRIORITY_NAMES[priority]] = {
+                    "count": stats["count"],
+                    "meanWaitMs": 1000 * stats["wait"] / count,
+                    "maxWaitMs": 1000 * stats["maxWait"],
+                    "meanServiceMs": 1000 * stats["service"] / count,
+                }
+        return report
@@ -0,0 +1,167 @@
+"""
+Cloe Multithreaded Workers
+
+Copyright (C) `2021-2022` `<Alarcon Ace Belen>`
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <http://www.gnu.org/licenses/>.
+"""
+
+import logging
+from typing import Callable, Optional
+
+from PyQt5.QtCore import QObject, QThreadPool, pyqtSignal, pyqtSlot
+
+from .base import BaseWorker
+
+logger = logging.getLogger(__name__)
+
+
+class LatestWinsScheduler(QObject):
+    """Runs one task at a time, keeping only the latest of the waiting tasks
+
+    A submitted task replaces the task waiting to start, if any, and cancels the
+    running task. Every task is tagged with a request ID and results older than
+    a delivered result are dropped.
+
+    Args:
+        threadpool (QThreadPool, optional): Pool where tasks are run.
+        Defaults to the global thread pool.
+        priority (int, optional): Priority of the tasks in the pool. Defaults to 0.
+        parent (QObject, optional): Parent object. Defaults to None.
+
+    Signals:
+        result: Emit the request ID and the result of the task
+        progress: Emit the request ID and the partial result of the running task
+    """
+
+    result = pyqtSignal(int, object)
+    progress = pyqtSignal(int, object)
+
+    def __init__(
+        self,
+        threadpool: Optional[QThreadPool] = None,
+        priority=0,
+        parent: QObject = None,
+    ):
+        super().__init__(parent)
+        self.threadpool = threadpool or QThreadPool.globalInstance()
+        self.priority = priority
+
+        self._lastRequestId = 0
+        self._lastResultId = 0
+        self._running: Optional[int] = None
+        self._pending: Optional[tuple[int, BaseWorker]] = None
+        # Keep the workers alive until their queued signals are handled
+        self._workers: dict[int, BaseWorker] = {}
+
+        # Metrics
+        self.submitted = 0
+        self.dropped = 0
+        self.stale = 0
+        self.failed = 0
+        self.cancelled = 0
+        self.maxDepth = 0
+
+    def depth(self) -> int:
+        """
+        Number of tasks running or waiting to start
+        """
+        return (self._running is not None) + (self._pending is not None)
+
+    def stats(self) -> dict:
+        return {
+            "depth": self.depth(),
+            "maxDepth": self.maxDepth,
+            "submitted": self.submitted,
+            "dropped": self.dropped,
+            "stale": self.stale,
+            "failed": self.failed,
+            "cancelled": self.cancelled,
+        }
+
+    def submit(self, fn: Callable, *args, **kwargs) -> int:
+        """Queues fn(*args, **kwargs), superseding the previous tasks
+
+        Returns:
+            int: Request ID of the task
+        """
+        self._lastRequestId += 1
+        requestId = self._lastRequestId
+
+        worker = BaseWorker(fn, *args, **kwargs)
+        worker.signals.setProperty("requestId", requestId)
+        worker.signals.result.connect(self.onResult)
+        worker.signals.progress.connect(self.onProgress)
+        worker.signals.error.connect(self.onError)
+        worker.signals.cancelled.connect(self.onCancelled)
+        worker.signals.finished.connect(self.onFinished)
+
+        if self._pending is not None:
+            self.dropped += 1
+            del self._workers[self._pending[0]]
+        self._workers[requestId] = worker
+        self._pending = (requestId, worker)
+        self.submitted += 1
+        self.cancelRunning()
+        self.maxDepth = max(self.maxDepth, self.depth())
+
+        self.startNext()
+        return requestId
+
+    def cancelRunning(self):
+        if self._running is not None:
+            self._workers[self._running].cancel()
+
+    def startNext(self):
+        if self._running is not None or self._pending is None:
+            return
+        self._running, worker = self._pending
+        self._pending = None
+        self.threadpool.start(worker, self.priority)
+
+    # ------------------------------------ Slots ------------------------------------ #
+
+    @pyqtSlot(object)
+    def onResult(self, output):
+        requestId = self.sender().property("requestId")
+        if requestId < self._lastResultId:
+            self.stale += 1
+            return
+        self._lastResultId = requestId
+        self.result.emit(requestId, output)
+
+    @pyqtSlot(object)
+    def onProgress(self, output):
+        # Partial results of a superseded task are no longer worth showing
+        requestId = self.sender().property("requestId")
+        if requestId != self._running or self._workers[requestId].isCancelled():
+            return
+        self.progress.emit(requestId, output)
+
+    @pyqtSlot(object)
+    def onError(self, error: Exception):
+        self.failed += 1
+        logger.error("OCR request failed", exc_info=error)
+
+    @pyqtSlot()
+    def onCancelled(self):
+        self.cancelled += 1
+
+    @pyqtSlot()
+    def onFinished(self):
+        requestId = self.sender().property("requestId")
+        if requestId == self._running:
+            self._running = None
+        self._workers.pop(requestId, None)
+        self.startNext()
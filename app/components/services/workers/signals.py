@@ -25,7 +25,13 @@ class BaseWorkerSignal(QObject):
     Signals:
         finished: Emit when thread finished the task
         result: Emit the result of the task
+        error: Emit the exception raised by the task
+        cancelled: Emit instead of result when the task was cancelled
+        progress: Emit the partial result of the task while it runs
     """
 
     finished = pyqtSignal()
     result = pyqtSignal(object)
+    error = pyqtSignal(object)
+    cancelled = pyqtSignal()
+    progress = pyqtSignal(object)
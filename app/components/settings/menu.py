@@ -19,7 +19,7 @@ along with this program.  If not, see <http://www.gnu.org/licenses/>.
 
 from PyQt5.QtWidgets import QVBoxLayout, QWidget, QTabWidget
 
-from .tabs import ViewSettingsTab, HotkeySettingsTab
+from .tabs import OCRSettingsTab, ViewSettingsTab, HotkeySettingsTab
 
 
 class SettingsMenu(QWidget):
@@ -35,6 +35,7 @@ class SettingsMenu(QWidget):
         self.tabs = QTabWidget()
         self.tabs.addTab(HotkeySettingsTab(self), "HOTKEYS")
         self.tabs.addTab(ViewSettingsTab(self), "VIEW")
+        self.tabs.addTab(OCRSettingsTab(self), "OCR")
 
         self.setLayout(QVBoxLayout(self))
         self.layout().addWidget(self.tabs)
@@ -42,3 +43,6 @@ class SettingsMenu(QWidget):
 
     def onSaveHotkeys(self):
         self.systemTray.loadHotkeys()
+
+    def onSaveOCR(self):
+        self.systemTray.loadPreviewPolicy()
@@ -18,4 +18,5 @@ along with this program.  If not, see <http://www.gnu.org/licenses/>.
 """
 
 from .hotkey import HotkeySettingsTab
+from .ocr import OCRSettingsTab
 from .view import ViewSettingsTab, ViewContainer
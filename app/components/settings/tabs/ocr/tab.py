@@ -0,0 +1,124 @@
+"""
+Cloe Settings Tab Components
+
+Copyright (C) `2021-2022` `<Alarcon Ace Belen>`
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <http://www.gnu.org/licenses/>.
+"""
+
+from PyQt5.QtCore import Qt
+from PyQt5.QtGui import QShowEvent
+from PyQt5.QtWidgets import QComboBox, QGridLayout, QLabel, QSpinBox, QWidget
+
+from ..tab import BaseSettingsTab
+from utils.constants import OCR_CONFIG, OCR_DEFAULT
+from utils.ocr import PREVIEW_MODES
+
+# Labels of the preview modes, in the order of PREVIEW_MODES
+PREVIEW_MODE_LABELS = ["While dragging", "When the selection stops", "On release only"]
+
+
+class OCRSettingsTab(BaseSettingsTab):
+    """
+    Settings tab for OCR-related settings
+    """
+
+    def __init__(self, parent: QWidget):
+        super().__init__(parent, OCR_CONFIG)
+        self._defaults = {
+            prop: OCR_DEFAULT[prop]
+            for prop in ["previewMode", "previewMinMs", "previewMaxMs"]
+        }
+        self._types = {"previewMinMs": int, "previewMaxMs": int}
+        self.loadSettings()
+
+        self.setLayout(QGridLayout(self))
+        self.layout().setAlignment(Qt.AlignTop)
+        self.initButtons()
+        self.layout().addWidget(QWidget(), self.layout().rowCount(), 0)
+        self.layout().setRowStretch(self.layout().rowCount() - 1, 1)
+        self.addButtonBar(self.layout().rowCount())
+
+    # ------------------------------ UI Initializations ----------------------------- #
+
+    def initButtons(self):
+        """
+        Initialize controls for the preview
+        """
+
+        # Button Initializations
+        _previewTitle = QLabel("Preview ")
+        self._previewMode = QComboBox()
+        for mode, label in zip(PREVIEW_MODES, PREVIEW_MODE_LABELS):
+            self._previewMode.addItem(label, mode)
+        _intervalTitle = QLabel("Interval ")
+        self._previewMinMs = self.createSpinBox()
+        self._previewMaxMs = self.createSpinBox()
+        self._previewLatency = QLabel()
+        self.updateWidgets()
+
+        # Layout
+        self.layout().addWidget(_previewTitle, 0, 0, 1, 1)
+        self.layout().addWidget(self._previewMode, 0, 1, 1, 4)
+        self.layout().addWidget(_intervalTitle, 1, 0, 1, 1)
+        self.layout().addWidget(self._previewMinMs, 1, 1, 1, 1)
+        self.layout().addWidget(QLabel("to"), 1, 2, 1, 1, alignment=Qt.AlignCenter)
+        self.layout().addWidget(self._previewMaxMs, 1, 3, 1, 1)
+        self.layout().addWidget(self._previewLatency, 2, 1, 1, 4)
+
+        # Signals and Slots
+        self._previewMode.currentIndexChanged.connect(
+            lambda: self.setProperty("previewMode", self._previewMode.currentData())
+        )
+        self._previewMinMs.valueChanged.connect(
+            lambda value: self.setProperty("previewMinMs", value)
+        )
+        self._previewMaxMs.valueChanged.connect(
+            lambda value: self.setProperty("previewMaxMs", value)
+        )
+
+    def createSpinBox(self) -> QSpinBox:
+        spinBox = QSpinBox()
+        spinBox.setRange(0, 5000)
+        spinBox.setSingleStep(50)
+        spinBox.setSuffix(" ms")
+        return spinBox
+
+    def updateWidgets(self):
+        self._previewMode.setCurrentIndex(self._previewMode.findData(self.previewMode))
+        self._previewMinMs.setValue(self.previewMinMs)
+        self._previewMaxMs.setValue(self.previewMaxMs)
+
+    def showEvent(self, event: QShowEvent):
+        # Overridden to show what the policy learned so far
+        policy = self.menu.systemTray.executor.previewPolicy
+        if policy is not None:
+            self._previewLatency.setText(
+                f"Previews take {policy.latency:.0f} ms, "
+                f"so the interval is {policy.interval()} ms"
+            )
+        return super().showEvent(event)
+
+    # ----------------------------------- Settings ---------------------------------- #
+
+    def saveSettings(self):
+        super().saveSettings()
+        self.menu.onSaveOCR()
+
+    def resetSettings(self):
+        # Overridden to keep the other OCR settings, which share the file
+        for propName in self._defaults:
+            self.settings.remove(propName)
+        self.loadSettings()
+        self.updateWidgets()
@@ -35,7 +35,11 @@ class ViewContainer(BaseSettings):
     def __init__(self, parent: QWidget, file=VIEW_CONFIG):
         super().__init__(parent, file)
         self._defaults = VIEW_DEFAULT
-        self._types = {"previewPadding": int, "selectionBorderThickness": int}
+        self._types = {
+            "previewPadding": int,
+            "selectionBorderThickness": int,
+            "freezeScreen": lambda v: str(v).lower() == "true",
+        }
         self.loadSettings()
 
     def getPreviewTextStyles(
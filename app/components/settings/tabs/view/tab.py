@@ -21,6 +21,7 @@ from typing import Any
 
 from PyQt5.QtCore import Qt
 from PyQt5.QtWidgets import (
+    QCheckBox,
     QGridLayout,
     QLabel,
     QPushButton,
@@ -108,9 +109,25 @@ class ViewSettingsTab(ViewContainer, BaseSettingsTab):
         )
         _windowColor.clicked.connect(lambda: self.getColor("windowColor"))
 
+        # --------------------------------- Capture --------------------------------- #
+
+        # Button Initializations
+        _captureTitle = QLabel("Capture ")
+        self._freezeScreen = QCheckBox("Freeze screen while selecting")
+        self._freezeScreen.setChecked(self.freezeScreen)
+
+        # Layout
+        self.layout().addWidget(_captureTitle, 2, 0, 1, 1)
+        self.layout().addWidget(self._freezeScreen, 2, 1, 1, 4)
+
+        # Signals and Slots
+        self._freezeScreen.toggled.connect(
+            lambda checked: self.setProperty("freezeScreen", checked)
+        )
+
     def initPreview(self):
         self._preview = Preview(self)
-        self.layout().addWidget(self._preview, 2, 0, 1, -1)
+        self.layout().addWidget(self._preview, 3, 0, 1, -1)
         self.layout().setRowStretch(self.layout().rowCount() - 1, 1)
 
     # ----------------------------------- Settings ---------------------------------- #
@@ -119,6 +136,7 @@ class ViewSettingsTab(ViewContainer, BaseSettingsTab):
         # Overridden to update styles on reset
         super().resetSettings()
         self.updateViewStyles()
+        self._freezeScreen.setChecked(self.freezeScreen)
 
     # ------------------------- Property Setters and Getters ------------------------ #
 
@@ -17,13 +17,31 @@ You should have received a copy of the GNU General Public License
 along with this program.  If not, see <http://www.gnu.org/licenses/>.
 """
 
-from PyQt5.QtCore import QPoint, QRect, QSize, QThreadPool, QTimer, Qt, pyqtSlot
-from PyQt5.QtGui import QCursor, QPixmap
+import logging
+from threading import Event
+from time import perf_counter
+from typing import Optional
+
+from PyQt5.QtCore import QPoint, QRect, QSize, QTimer, Qt, pyqtSlot
+from PyQt5.QtGui import QCursor, QPixmap, QRegion
 from PyQt5.QtWidgets import QApplication, QGraphicsView, QLabel, QWidget
 
 from components.misc import RubberBand
-from components.services import BaseWorker
-from utils.scripts import logText, pixmapToText
+from components.services import BaseWorker, InferenceExecutor, LatestWinsScheduler
+from utils.constants import OCR_CONFIG, OCR_DEFAULT
+from utils.ocr import PreviewPolicy
+from utils.scripts import (
+    imageDifference,
+    inkRatio,
+    logText,
+    pixmapsToText,
+    pixmapToText,
+    readSettings,
+    sortReadingOrder,
+)
+from utils.tracing import tracer
+
+logger = logging.getLogger(__name__)
 
 
 class BaseOCRView(QGraphicsView):
@@ -34,10 +52,43 @@ class BaseOCRView(QGraphicsView):
     def __init__(self, parent: QWidget):
         super().__init__(parent)
 
+        # Only the latest selection is processed, older ones are cancelled
+        self.executor: InferenceExecutor = self.parent().executor
+
+        # Shared by the views, so that the preview latency is learned across snips
+        self.previewPolicy = self.executor.previewPolicy or PreviewPolicy()
         self._timer = QTimer()
-        self._timer.setInterval(300)
         self._timer.setSingleShot(True)
-        self._timer.timeout.connect(self.rubberBandStopped)
+        self._timer.timeout.connect(self.previewTimeout)
+        self.scheduler = LatestWinsScheduler(
+            self.executor, InferenceExecutor.PREVIEW, parent=self
+        )
+        self.scheduler.result.connect(self.ocrFinished)
+        self.scheduler.progress.connect(self.ocrProgress)
+
+        # Selection of each preview request, to know if the preview is up to date
+        self._requestGeometry: dict[int, QRect] = {}
+        self._resultGeometry = QRect()
+        # Time each preview request was made, to measure its latency
+        self._requestTime: dict[int, float] = {}
+        # Set once the request reaches the model, only those latencies are learned
+        self._requestInference: dict[int, Event] = {}
+        # Requests whose partial text was shown, to measure the first character once
+        self._streamed: set[int] = set()
+
+        # Last preview request, which later previews of the same crop reuse
+        config = readSettings(OCR_CONFIG, OCR_DEFAULT)
+        self._previewJitter = config["previewJitterPx"]
+        self._previewThreshold = config["previewThreshold"]
+        self._inkContrast = config["gateInkContrast"]
+        self._lastPreview: Optional[tuple[int, QRect, QPixmap]] = None
+
+        # Metrics
+        self.previewsRun = 0
+        self.previewsReused = 0
+
+        # Regions marked with Shift+drag, with their crops
+        self._regions: list[tuple[RubberBand, QPixmap]] = []
 
         self._initialPoint = QPoint()
         self.rubberBand = RubberBand(self.parent())
@@ -47,7 +98,9 @@ class BaseOCRView(QGraphicsView):
         self._ocrText.hide()
         self._ocrText.setObjectName("previewText")
 
-        self.pixmap = QPixmap()
+        # Snapshot of the active screen when the view is frozen
+        self.frame: Optional[QPixmap] = None
+        self._frameRatio = 1.0
 
         self.activeScreenIndex = 0
 
@@ -59,10 +112,64 @@ class BaseOCRView(QGraphicsView):
         self.activeScreenIndex = index
         return index
 
-    def captureScreen(self, index: int):
+    def captureFrame(self, index: int):
+        """Takes a snapshot of the whole screen to slice every crop from
+
+        Args:
+            index (int): Index of the screen to grab.
+        """
         screen = QApplication.screens()[index]
-        s = screen.size()
-        self.pixmap = screen.grabWindow(0).scaled(s.width(), s.height())
+        frame = screen.grabWindow(0)
+        if frame.isNull():
+            return
+        # The snapshot is in device pixels while the view is in screen coordinates
+        self.setFrame(frame, frame.width() / max(screen.size().width(), 1))
+
+    def setFrame(self, frame: QPixmap, ratio=1.0):
+        """Sets the snapshot every crop is sliced from
+
+        Args:
+            frame (QPixmap): Snapshot of the screen.
+            ratio (float, optional): Device pixels per screen coordinate.
+            Defaults to 1.0.
+        """
+        self.frame = frame
+        self._frameRatio = ratio
+        self.frame.setDevicePixelRatio(ratio)
+
+    def releaseFrame(self):
+        self.frame = None
+
+    def captureScreen(self, index: int, rect: QRect) -> QPixmap:
+        """Grabs only the given region of the screen
+
+        If a frame was captured, the region is sliced from it instead.
+
+        Args:
+            index (int): Index of the screen to grab.
+            rect (QRect): Region in screen coordinates. Qt maps it to device pixels,
+            so the returned pixmap keeps the full resolution of the screen.
+        """
+        if self.frame is not None:
+            r = self._frameRatio
+            # An empty rect would copy the whole frame
+            rect = QRect(
+                round(rect.x() * r),
+                round(rect.y() * r),
+                round(rect.width() * r),
+                round(rect.height() * r),
+            ).intersected(self.frame.rect())
+            if rect.isEmpty():
+                return QPixmap()
+            with tracer.span("pixmapCopy"):
+                return self.frame.copy(rect)
+
+        screen = QApplication.screens()[index]
+        rect = rect.intersected(QRect(QPoint(), screen.size()))
+        if rect.isEmpty():
+            return QPixmap()
+        with tracer.span("grabWindow"):
+            return screen.grabWindow(0, rect.x(), rect.y(), rect.width(), rect.height())
 
     @pyqtSlot()
     def rubberBandStopped(self):
@@ -71,13 +178,193 @@ class BaseOCRView(QGraphicsView):
             self._ocrText.adjustSize()
             self._ocrText.show()
 
-        self.captureScreen(self.activeScreenIndex)
-        pixmap = self.pixmap.copy(self.rubberBand.geometry())
+        geometry = self.rubberBand.geometry()
+        with tracer.span("captureScreen"):
+            pixmap = self.captureScreen(self.activeScreenIndex, geometry)
+
+        with tracer.span("previewDifference"):
+            unchanged = self.isPreviewUnchanged(geometry, pixmap)
+        if unchanged:
+            self.reusePreview(geometry)
+            return
+
+        inferenceEvent = Event()
+        requestId = self.scheduler.submit(
+            pixmapToText,
+            pixmap,
+            self.executor.model,
+            self.executor.cache,
+            cancelEvent=Event(),
+            gate=self.executor.gate,
+            onProgress=True,
+            inferenceEvent=inferenceEvent,
+        )
+        self._requestGeometry[requestId] = geometry
+        self._requestTime[requestId] = perf_counter()
+        self._requestInference[requestId] = inferenceEvent
+        self._lastPreview = (requestId, geometry, pixmap)
+        self.previewsRun += 1
+
+    def isPreviewUnchanged(self, geometry: QRect, pixmap: QPixmap) -> bool:
+        """Checks if the crop is about the same as the last preview's
+
+        It is if no edge of the selection moved further than previewJitterPx, the
+        pixels both crops share differ less than previewThreshold, and less than
+        previewThreshold of each strip the move added or cut off is ink. The shared
+        pixels only differ if the screen changed, while the strips catch an edge
+        that moved into a glyph.
+
+        Args:
+            geometry (QRect): Selection of the crop.
+            pixmap (QPixmap): Crop of the selection.
+        """
+        if self._lastPreview is None or pixmap.isNull():
+            return False
+        _, lastGeometry, lastPixmap = self._lastPreview
+        moved = (
+            geometry.left() - lastGeometry.left(),
+            geometry.top() - lastGeometry.top(),
+            geometry.right() - lastGeometry.right(),
+            geometry.bottom() - lastGeometry.bottom(),
+        )
+        if any(abs(d) > self._previewJitter for d in moved):
+            return False
 
-        worker = BaseWorker(pixmapToText, pixmap, self.parent().ocrModel)
-        worker.signals.result.connect(self.ocrFinished)
-        self._timer.timeout.disconnect(self.rubberBandStopped)
-        QThreadPool.globalInstance().start(worker)
+        overlap = geometry.intersected(lastGeometry)
+        if overlap.isEmpty():
+            return False
+        difference = imageDifference(
+            self.cropSelection(pixmap, geometry, overlap),
+            self.cropSelection(lastPixmap, lastGeometry, overlap),
+        )
+        if difference > self._previewThreshold:
+            return False
+
+        # Strips the move added to the new crop, then those it cut off the last one
+        strips = [
+            self.cropSelection(crop, origin, strip)
+            for crop, origin, other in [
+                (pixmap, geometry, lastGeometry),
+                (lastPixmap, lastGeometry, geometry),
+            ]
+            for strip in QRegion(origin).subtracted(QRegion(other)).rects()
+        ]
+        return inkRatio(strips, pixmap, self._inkContrast) <= self._previewThreshold
+
+    def cropSelection(self, pixmap: QPixmap, geometry: QRect, rect: QRect) -> QPixmap:
+        """Crops part of the crop of a selection
+
+        Args:
+            pixmap (QPixmap): Crop of the selection.
+            geometry (QRect): Selection of the crop.
+            rect (QRect): Part to crop, in screen coordinates.
+        """
+        # Crops are in device pixels while the selections are in screen coordinates
+        ratio = pixmap.width() / max(geometry.width(), 1)
+        rect = rect.translated(-geometry.topLeft())
+        rect = QRect(
+            round(rect.x() * ratio),
+            round(rect.y() * ratio),
+            round(rect.width() * ratio),
+            round(rect.height() * ratio),
+        ).intersected(pixmap.rect())
+        # An empty rect would copy the whole crop
+        if rect.isEmpty():
+            return QPixmap()
+        return pixmap.copy(rect)
+
+    def reusePreview(self, geometry: QRect):
+        """Makes the text of the last preview stand for the selection as well
+
+        Args:
+            geometry (QRect): Selection that reuses the last preview.
+        """
+        requestId = self._lastPreview[0]
+        if requestId in self._requestGeometry:
+            # Still running, its result is shown for this selection once done
+            self._requestGeometry[requestId] = geometry
+        else:
+            self._resultGeometry = geometry
+        self.previewsReused += 1
+
+    def finalOCR(self, geometry: QRect):
+        """Logs the text of the selection, running OCR first if the preview is outdated
+
+        Args:
+            geometry (QRect): Final selection.
+        """
+        if geometry == self._resultGeometry:
+            return logText(self._ocrText.text())
+
+        # Make room for the final request, which has a higher priority
+        self.scheduler.cancelRunning()
+        with tracer.span("captureScreen"):
+            pixmap = self.captureScreen(self.activeScreenIndex, geometry)
+        worker = BaseWorker(
+            pixmapToText,
+            pixmap,
+            self.executor.model,
+            self.executor.cache,
+            gate=self.executor.gate,
+        )
+        # Not connected to the view, which may be closed before the worker is done
+        worker.signals.result.connect(logText)
+        self.executor.start(worker, InferenceExecutor.FINAL)
+
+    # ----------------------------------- Regions ----------------------------------- #
+
+    def addRegion(self, geometry: QRect):
+        """Marks the selection as a region to be converted later with regionsOCR
+
+        Args:
+            geometry (QRect): Selection to mark.
+        """
+        if geometry.width() <= 1 or geometry.height() <= 1:
+            return
+        # Crop now, before other regions are drawn over the screen
+        pixmap = self.captureScreen(self.activeScreenIndex, geometry)
+
+        region = RubberBand(self.parent())
+        region.copyStyle(self.rubberBand)
+        region.setGeometry(geometry)
+        region.show()
+        self._regions.append((region, pixmap))
+
+    def hasRegions(self) -> bool:
+        return bool(self._regions)
+
+    def regionsOCR(self):
+        """
+        Converts all marked regions in one batch and logs the text in reading order
+        """
+        if not self._regions:
+            return
+
+        geometries = [region.geometry() for region, _ in self._regions]
+        pixmaps = [
+            self._regions[geometries.index(geometry)][1]
+            for geometry in sortReadingOrder(geometries)
+        ]
+        self.clearRegions()
+
+        self.scheduler.cancelRunning()
+        worker = BaseWorker(
+            pixmapsToText,
+            pixmaps,
+            self.executor.model,
+            self.executor.cache,
+            self.executor.gate,
+        )
+        worker.signals.result.connect(
+            lambda texts: logText("\n".join(text for text in texts if text))
+        )
+        self.executor.start(worker, InferenceExecutor.FINAL)
+
+    def clearRegions(self):
+        for region, _ in self._regions:
+            region.hide()
+            region.deleteLater()
+        self._regions = []
 
     # ------------------------------------ Mouse ------------------------------------ #
 
@@ -90,7 +377,7 @@ class BaseOCRView(QGraphicsView):
 
     def mouseMoveEvent(self, event):
         if event.buttons() & Qt.LeftButton:
-            self._timer.start()
+            self.schedulePreview()
             self.rubberBand.setGeometry(
                 QRect(self._initialPoint, event.pos()).normalized()
             )
@@ -102,25 +389,86 @@ class BaseOCRView(QGraphicsView):
                 QRect(self._initialPoint, event.pos()).normalized()
             )
 
-            text = self._ocrText.text()
-            logText(text)
+            self._timer.stop()
+            geometry = self.rubberBand.geometry()
+            if event.modifiers() & Qt.ShiftModifier:
+                self.addRegion(geometry)
+            elif self.hasRegions():
+                self.addRegion(geometry)
+                self.regionsOCR()
+            else:
+                self.finalOCR(geometry)
             self.rubberBand.hide()
             self._ocrText.hide()
 
         super().mouseReleaseEvent(event)
 
+    def previewTimeout(self):
+        # Live previews wait for the running one instead of cancelling it
+        if self.previewPolicy.mode == "live" and self.scheduler.depth():
+            self._timer.start(self.previewPolicy.interval())
+            return
+        self.rubberBandStopped()
+
+    def schedulePreview(self):
+        """
+        Starts or restarts the preview timer as the selection moves, per the mode
+        of the preview policy
+        """
+        mode = self.previewPolicy.mode
+        if mode == "release":
+            return
+        # Live previews run every interval, so a running timer is left as is
+        if mode == "live" and self._timer.isActive():
+            return
+        self._timer.start(self.previewPolicy.interval())
+
     # ------------------------------------ Close ------------------------------------ #
 
     def closeEvent(self, event):
         # Ensure that object is deleted before closing
         self.deleteLater()
         self.rubberBand.hide()
+        self.clearRegions()
+        self.releaseFrame()
         return super().closeEvent(event)
 
-    def ocrFinished(self, text):
+    def ocrProgress(self, requestId: int, text: str):
+        # Only the latest selection is shown, its partial text is not final
+        if self._lastPreview is None or requestId != self._lastPreview[0]:
+            return
+        self._resultGeometry = QRect()
+        if requestId not in self._streamed and requestId in self._requestTime:
+            self._streamed.add(requestId)
+            if tracer.enabled:
+                tracer.add(
+                    "firstCharacter", self._requestTime[requestId], perf_counter()
+                )
         try:
             self._ocrText.setText(text)
             self._ocrText.adjustSize()
-            self._timer.timeout.connect(self.rubberBandStopped)
-        except Exception as e:
-            print(e)
+        except Exception:
+            logger.exception("Could not show the partial preview text")
+
+    def ocrFinished(self, requestId: int, text: str):
+        self._resultGeometry = self._requestGeometry.get(requestId, QRect())
+        for oldId in [i for i in self._requestGeometry if i <= requestId]:
+            del self._requestGeometry[oldId]
+        if requestId in self._requestTime:
+            start = self._requestTime[requestId]
+            latency = perf_counter() - start
+            # Cache hits and crops the gate rejected say nothing about the model
+            if self._requestInference[requestId].is_set():
+                self.previewPolicy.record(latency * 1000)
+            if tracer.enabled:
+                tracer.add("previewText", start, start + latency)
+        for oldId in [i for i in self._requestTime if i <= requestId]:
+            del self._requestTime[oldId]
+            del self._requestInference[oldId]
+        self._streamed = {i for i in self._streamed if i > requestId}
+        try:
+            with tracer.span("ocrFinished"):
+                self._ocrText.setText(text)
+                self._ocrText.adjustSize()
+        except Exception:
+            logger.exception("Could not show the preview text")
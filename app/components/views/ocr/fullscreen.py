@@ -17,9 +17,9 @@ You should have received a copy of the GNU General Public License
 along with this program.  If not, see <http://www.gnu.org/licenses/>.
 """
 
-from PyQt5.QtCore import Qt
-from PyQt5.QtGui import QColor, QMouseEvent
-from PyQt5.QtWidgets import QWidget
+from PyQt5.QtCore import QPointF, QRectF, QSizeF, Qt
+from PyQt5.QtGui import QColor, QKeyEvent, QMouseEvent
+from PyQt5.QtWidgets import QGraphicsScene, QWidget
 
 from components.settings import ViewContainer
 from .base import BaseOCRView
@@ -42,8 +42,34 @@ class FullScreenView(BaseOCRView, ViewContainer):
 
     def setBackgroundColor(self, color: QColor):
         self.setStyleSheet(f"background-color: {colorToRGBA(color)}")
+        # Tints the frozen frame, if any, the same way as the window color
+        self.setForegroundBrush(color)
+
+    def captureFrame(self, index: int):
+        # Overridden to show the frozen frame as the backdrop
+        super().captureFrame(index)
+        if self.frame is None:
+            return
+        scene = QGraphicsScene(self)
+        scene.addPixmap(self.frame)
+        scene.setSceneRect(
+            QRectF(QPointF(), QSizeF(self.frame.size()) / self._frameRatio)
+        )
+        self.setScene(scene)
+        self.setAlignment(Qt.AlignLeft | Qt.AlignTop)
 
     def mouseReleaseEvent(self, event: QMouseEvent):
         BaseOCRView.mouseReleaseEvent(self, event)
+        # Shift+drag marks a region and keeps the view open for more regions
+        if event.modifiers() & Qt.ShiftModifier:
+            return
         # Ensure that parent is closed
         self.parent().close()
+
+    def keyPressEvent(self, event: QKeyEvent):
+        # Enter converts the marked regions without adding another one
+        if event.key() in (Qt.Key_Return, Qt.Key_Enter) and self.hasRegions():
+            self.regionsOCR()
+            self.parent().close()
+            return
+        return super().keyPressEvent(event)
@@ -51,14 +51,18 @@ class ExternalWindow(QMainWindow):
         # WindowStaysOnTopHint & Popup flags ensures that the widget is the top window.
         self.setWindowFlags(Qt.FramelessWindowHint | Qt.WindowStaysOnTopHint | Qt.Popup)
 
+        self.executor = parent.executor
         self.setCentralWidget(FullScreenView(self))
-        self.ocrModel = parent.ocrModel
 
     def showFullScreen(self):
         # Overridden to show on the active screen
         fullscreen: FullScreenView = self.centralWidget()
         screenIndex = fullscreen.getActiveScreenIndex()
 
+        # Take the snapshot before the window covers the screen
+        if fullscreen.freezeScreen:
+            fullscreen.captureFrame(screenIndex)
+
         # TODO: Find an alternative way to show the active screen,
         # since QDesktopWidget is obsolete according to Qt docs
         screen = QDesktopWidget().screenGeometry(screenIndex)
@@ -17,22 +17,40 @@ You should have received a copy of the GNU General Public License
 along with this program.  If not, see <http://www.gnu.org/licenses/>.
 """
 
-from manga_ocr import MangaOcr
-from PyQt5.QtCore import QObject, QSettings, QThreadPool
+from functools import partial
+
+from PyQt5.QtCore import QObject, QSettings
 from PyQt5.QtGui import QIcon
 from PyQt5.QtWidgets import QApplication, QMenu, QSystemTrayIcon
 
 from .external import ExternalWindow
-from components.popups import AboutPopup
-from components.services import BaseWorker, Hotkeys
+from components.popups import AboutPopup, BasePopup
+from components.services import BaseWorker, Hotkeys, InferenceExecutor, OCRServer
 from components.settings import SettingsMenu
 from utils.constants import (
     ABOUT_ICON,
     APP_LOGO,
     EXIT_ICON,
     HOTKEY_CONFIG,
+    OCR_CACHE,
+    OCR_CONFIG,
+    OCR_DEFAULT,
     SETTINGS_ICON,
 )
+from utils.ocr import (
+    ContentGate,
+    MicroBatcher,
+    OCRCache,
+    PreviewPolicy,
+    ProcessBatcher,
+    cacheNamespace,
+    engineOptions,
+    getEngine,
+    loadEngine,
+)
+from utils.scripts import readSettings
+from utils.timeline import timeline
+from utils.tracing import tracer
 
 
 class SystemTray(QSystemTrayIcon):
@@ -44,9 +62,13 @@ class SystemTray(QSystemTrayIcon):
         super().__init__(QIcon(APP_LOGO), parent)
 
         # State trackers and configurations
-        self.threadpool = QThreadPool()
-        self.ocrModel: MangaOcr = None
+        # The executor owns the model, so that it is only used by one thread
+        self.executor = InferenceExecutor()
+        self.executor.cache = self.createCache()
+        self.executor.gate = self.createGate()
+        self.loadPreviewPolicy()
         self.loadHotkeys()
+        tracer.enabled = readSettings(OCR_CONFIG, OCR_DEFAULT)["tracing"]
 
         # Menu
         menu = QMenu(parent)
@@ -54,12 +76,18 @@ class SystemTray(QSystemTrayIcon):
 
         # Menu Actions
         menu.addAction(QIcon(SETTINGS_ICON), "Settings", self.openSettings)
+        menu.addAction("Startup Timeline", self.openTimeline)
+        tracing = menu.addAction("Tracing", self.setTracing)
+        tracing.setCheckable(True)
+        tracing.setChecked(tracer.enabled)
+        menu.addAction("Dump Trace", self.dumpTrace)
         menu.addSeparator()
         menu.addAction(QIcon(ABOUT_ICON), "About Chloe", self.openAbout)
         menu.addAction(QIcon(EXIT_ICON), "Exit", self.closeApplication)
 
         self.externalWindow = None
         self.settingsMenu = None
+        self.server = None
 
     def processGlobalHotkey(self, objectMethod: tuple[QObject, str]):
         obj, fn = objectMethod
@@ -86,11 +114,76 @@ class SystemTray(QSystemTrayIcon):
             hotkeyDict["<Alt>+Q"] = (self, "startCapture")
         return hotkeyDict
 
+    def createCache(self):
+        config = readSettings(OCR_CONFIG, OCR_DEFAULT)
+        return OCRCache(
+            maxEntries=config["cacheEntries"],
+            maxBytes=config["cacheBytes"],
+            perceptual=config["cachePerceptual"],
+            path=OCR_CACHE if config["cacheOnDisk"] else None,
+            namespace=cacheNamespace(
+                config["engine"], engineOptions(config["engine"], config)
+            ),
+        )
+
+    def createGate(self):
+        config = readSettings(OCR_CONFIG, OCR_DEFAULT)
+        if not config["gateEnabled"]:
+            return None
+        return ContentGate(
+            minSide=config["gateMinSide"],
+            minInkRatio=config["gateMinInkRatio"],
+            inkContrast=config["gateInkContrast"],
+            minStd=config["gateMinStd"],
+        )
+
+    def loadPreviewPolicy(self):
+        config = readSettings(OCR_CONFIG, OCR_DEFAULT)
+        policy = PreviewPolicy(
+            mode=config["previewMode"],
+            minInterval=config["previewMinMs"],
+            maxInterval=config["previewMaxMs"],
+        )
+        # Keeps the latency learned so far when the settings change
+        if self.executor.previewPolicy is not None:
+            policy.latency = self.executor.previewPolicy.latency
+            policy.measured = self.executor.previewPolicy.measured
+        self.executor.previewPolicy = policy
+
     def loadModel(self):
         def loadModelHelper():
             try:
                 self.showMessage("Please wait", "Loading the MangaOCR model ...")
-                self.ocrModel = MangaOcr()
+                config = readSettings(OCR_CONFIG, OCR_DEFAULT)
+                name = config["engine"]
+                options = engineOptions(name, config)
+
+                if config["separateProcess"]:
+                    # Loaded and warmed up in the OCR process, nothing to import here
+                    timeline.mark("importsDone")
+                    self.executor.model = ProcessBatcher(
+                        partial(
+                            loadEngine, name, config["warmupIterations"], **options
+                        ),
+                        maxBatch=config["batchSize"],
+                    )
+                    timeline.mark("modelConstructed")
+                    timeline.mark("warmupDone")
+                    return "success"
+
+                # Imported here since the engine loads torch, which delays the tray
+                # icon
+                engineClass = getEngine(name)
+                timeline.mark("importsDone")
+                engine = engineClass(**options)
+                timeline.mark("modelConstructed")
+
+                # Pays the first inference costs before the user's first preview,
+                # its duration is the delta of the warmupDone milestone
+                engine.warmup(config["warmupIterations"])
+                timeline.mark("warmupDone")
+
+                self.executor.model = MicroBatcher(engine, config["batchSize"])
                 return "success"
             except Exception as e:
                 return str(e)
@@ -101,15 +194,33 @@ class SystemTray(QSystemTrayIcon):
                     "MangaOCR model loaded",
                     "You are now using the MangaOCR model for Japanese text detection.",
                 )
+                self.startServer()
             else:
                 self.showMessage("Load Model Error", message)
 
         worker = BaseWorker(loadModelHelper)
         worker.signals.result.connect(loadModelConfirm)
-        self.threadpool.start(worker)
+        self.executor.start(worker, InferenceExecutor.FINAL)
+
+    def startServer(self):
+        config = readSettings(OCR_CONFIG, OCR_DEFAULT)
+        if not config["serverEnabled"] or self.server is not None:
+            return
+        try:
+            self.server = OCRServer(
+                self.executor,
+                host=config["serverHost"],
+                port=config["serverPort"],
+                concurrency=config["serverConcurrency"],
+                timeout=config["serverTimeout"],
+                maxBodySize=config["serverMaxBodyMB"] * 2**20,
+            )
+            self.server.start()
+        except OSError as e:
+            self.showMessage("OCR Service Error", str(e))
 
     def startCapture(self):
-        if self.ocrModel == None:
+        if self.executor.model == None:
             self.showMessage(
                 "MangaOCR model not yet loaded",
                 "Please wait until the MangaOCR model is loaded.",
@@ -125,8 +236,30 @@ class SystemTray(QSystemTrayIcon):
             self.settingsMenu = SettingsMenu(self)
         self.settingsMenu.show()
 
+    def openTimeline(self):
+        BasePopup("Startup Timeline", timeline.format()).exec()
+
+    def setTracing(self, enabled: bool):
+        tracer.enabled = enabled
+        if not enabled:
+            return
+        tracer.clear()
+
+    def dumpTrace(self):
+        try:
+            path = tracer.dump()
+        except OSError as e:
+            self.showMessage("Dump Trace Error", str(e))
+            return
+        message = f"Saved to {path}, open it in chrome://tracing or Perfetto."
+        BasePopup("Trace", f"{message}\n\n{tracer.format()}").exec()
+
     def openAbout(self):
         AboutPopup().exec()
 
     def closeApplication(self):
+        if self.server is not None:
+            self.server.stop()
+        if self.executor.model is not None:
+            self.executor.model.close()
         QApplication.instance().exit()
@@ -17,6 +17,11 @@ You should have received a copy of the GNU General Public License
 along with this program.  If not, see <http://www.gnu.org/licenses/>.
 """
 
+# Imported first, so where the OS does not tell when the process started, the
+# timeline starts as early as possible
+from utils.timeline import timeline
+
+import multiprocessing
 import sys
 
 from PyQt5.QtGui import QIcon
@@ -26,8 +31,12 @@ from components.windows import SystemTray
 from utils.constants import APP_LOGO, APP_NAME, STYLESHEET_DEFAULT
 
 if __name__ == "__main__":
+    # In the frozen app, lets a spawned OCR process run its target instead of
+    # starting another tray app
+    multiprocessing.freeze_support()
 
     app = QApplication(sys.argv)
+    timeline.mark("appCreated")
     app.setApplicationName(APP_NAME)
     app.setWindowIcon(QIcon(APP_LOGO))
     app.setQuitOnLastWindowClosed(False)
@@ -39,6 +48,7 @@ if __name__ == "__main__":
         app.setStyleSheet(fh.read())
 
     widget.show()
+    timeline.mark("trayShown")
     widget.loadModel()
     app.exec_()
     sys.exit()
@@ -22,6 +22,7 @@ from PyQt5.QtGui import QColor, QFont
 # ------------------------------------- General ------------------------------------- #
 
 APP_NAME = "Cloe"
+APP_VERSION = "0.1.0"
 
 # Icons
 APP_LOGO = "./assets/images/icons/logo.ico"
@@ -39,6 +40,13 @@ STYLESHEET_DEFAULT = "./assets/styles.qss"
 # Config
 HOTKEY_CONFIG = "./utils/cloe-hotkey.ini"
 VIEW_CONFIG = "./utils/cloe-view.ini"
+OCR_CONFIG = "./utils/cloe-ocr.ini"
+OCR_CACHE = "./utils/cloe-ocr-cache.sqlite3"
+MODEL_CACHE = "./utils/cloe-models"
+
+# Logs
+STARTUP_LOG = "./utils/cloe-startup.jsonl"
+TRACE_DIR = "./utils/cloe-traces"
 
 # Defaults
 HOTKEY_DEFAULT = {
@@ -68,6 +76,52 @@ VIEW_DEFAULT = {
     "selectionBorderThickness": 2,
     "selectionBackground": QColor(0, 128, 255, 60),
     "windowColor": QColor(255, 255, 255, 13),
+    # Capture
+    "freezeScreen": False,
+}
+OCR_DEFAULT = {
+    # Cache
+    "cacheEntries": 256,
+    "cacheBytes": 1048576,
+    "cachePerceptual": False,
+    "cacheOnDisk": False,
+    # Most images the model converts in one batch, such as the marked regions
+    "batchSize": 16,
+    # Crops are not converted if a side is shorter than gateMinSide, if fewer than
+    # gateMinInkRatio of the pixels differ from the background by gateInkContrast
+    # gray levels, or if the gray levels vary less than gateMinStd
+    "gateEnabled": True,
+    "gateMinSide": 10,
+    "gateMinInkRatio": 0.005,
+    "gateInkContrast": 48,
+    "gateMinStd": 6.0,
+    # Preview mode, one of live, pause or release. The interval follows the measured
+    # preview latency between previewMinMs and previewMaxMs.
+    "previewMode": "pause",
+    "previewMinMs": 100,
+    "previewMaxMs": 800,
+    # Previews reuse the last text while no edge of the selection moves further than
+    # previewJitterPx, the crop changes less than previewThreshold, from 0 to 1, and
+    # less than previewThreshold of the edges added or cut off is ink
+    "previewJitterPx": 3,
+    "previewThreshold": 0.01,
+    # Records the OCR pipeline spans from the start, see Tracing in the tray menu
+    "tracing": False,
+    # Runs the model in a separate process
+    "separateProcess": False,
+    # Local OCR service for other tools
+    "serverEnabled": False,
+    "serverHost": "127.0.0.1",
+    "serverPort": 7331,
+    "serverConcurrency": 4,
+    "serverTimeout": 30.0,
+    "serverMaxBodyMB": 32,
+    # Engine, one of manga_ocr or stub
+    "engine": "manga_ocr",
+    "precision": "fp32",
+    "stubLatencyMs": 50.0,
+    "stubPerImageMs": 20.0,
+    "warmupIterations": 1,
 }
 
 # Constants
@@ -0,0 +1,39 @@
+"""
+Cloe OCR Pipeline
+
+Copyright (C) `2021-2022` `<Alarcon Ace Belen>`
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <http://www.gnu.org/licenses/>.
+"""
+
+from .batching import MicroBatcher
+from .cache import OCRCache
+from .engines import (
+    ENGINES,
+    BaseEngine,
+    StubEngine,
+    cacheNamespace,
+    createEngine,
+    engineOptions,
+    getEngine,
+    loadEngine,
+)
+from .gate import ContentGate
+from .preview import PREVIEW_MODES, PreviewPolicy
+from .process import ModelProcess, ProcessBatcher
+from .replicas import ReplicaPool
+from .warmup import warmupModel
+
+# The generation and precision modules import torch, so they are only imported
+# where they are used
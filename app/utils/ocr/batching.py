@@ -0,0 +1,245 @@
+"""
+Cloe OCR Pipeline
+
+Copyright (C) `2021-2022` `<Alarcon Ace Belen>`
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <http://www.gnu.org/licenses/>.
+"""
+
+from collections import deque
+from functools import partial
+from threading import Condition, Event, Thread, current_thread
+from typing import TYPE_CHECKING, Callable, Optional
+
+from PIL import Image
+
+from utils.tracing import tracer
+
+from .streaming import ProgressCallback
+
+if TYPE_CHECKING:
+    from .engines import BaseEngine
+
+# Converts a batch of images to text, stopping early once all events are set, and
+# optionally reporting the partial texts to a ProgressCallback
+BatchRunner = Callable[..., list[str]]
+
+
+class BatchRequest:
+    """
+    Single image waiting to be converted by the MicroBatcher
+    """
+
+    def __init__(
+        self,
+        image: Image.Image,
+        cancelEvent: Optional[Event] = None,
+        onProgress: Optional[Callable[[str], None]] = None,
+    ):
+        self.image = image
+        self.cancelEvent = cancelEvent or Event()
+        self.onProgress = onProgress
+        self.done = Event()
+        self.text = ""
+        self.error: Optional[Exception] = None
+
+
+class MicroBatcher:
+    """Collects concurrent OCR requests and runs them through the engine together
+
+    The engine is only called from the batcher thread, callers only queue their
+    images and wait. Requests waiting when a batch starts are batched together, in
+    the order they were queued, up to maxBatch. Call close to stop the batcher
+    thread.
+
+    In the app every caller is a task of the single-thread InferenceExecutor, which
+    orders them by priority, so only the images of one ocrBatch call, such as the
+    marked regions or a batch of the OCR service, are ever batched together.
+
+    Args:
+        engine (BaseEngine): Loaded OCR engine.
+        maxBatch (int, optional): Maximum number of images per batch. Defaults to 16.
+    """
+
+    def __init__(self, engine: "BaseEngine", maxBatch=16):
+        self.engine = engine
+        self.maxBatch = maxBatch
+
+        self._queue: deque[BatchRequest] = deque()
+        self._running: list[BatchRequest] = []
+        self._condition = Condition()
+        self._closed = False
+
+        # Metrics
+        self.batches = 0
+        self.requests = 0
+
+        self._threads = [
+            Thread(target=self._run, args=(runBatch,), daemon=True)
+            for runBatch in self.batchRunners()
+        ]
+        for thread in self._threads:
+            thread.start()
+
+    def ocr(
+        self,
+        image: Image.Image,
+        cancelEvent: Optional[Event] = None,
+        onProgress: Optional[Callable[[str], None]] = None,
+    ) -> str:
+        """
+        Converts the image to text, blocking until its batch is done. onProgress is
+        called from the batcher thread with the partial text as it is generated.
+        """
+        return self.wait([self.submit(image, cancelEvent, onProgress)])[0]
+
+    def ocrBatch(
+        self,
+        images: list[Image.Image],
+        cancelEvents: Optional[list[Event]] = None,
+    ) -> list[str]:
+        """
+        Converts the images to text, returning the texts in the same order. Setting
+        the cancelEvent of an image stops its conversion early.
+        """
+        cancelEvents = cancelEvents or [None] * len(images)
+        return self.wait(
+            [self.submit(image, e) for image, e in zip(images, cancelEvents)]
+        )
+
+    def submit(
+        self,
+        image: Image.Image,
+        cancelEvent: Optional[Event] = None,
+        onProgress: Optional[Callable[[str], None]] = None,
+    ) -> BatchRequest:
+        request = BatchRequest(image, cancelEvent, onProgress)
+        with self._condition:
+            if self._closed:
+                raise RuntimeError("The batcher is closed")
+            self._queue.append(request)
+            self._condition.notify()
+        return request
+
+    def wait(self, requests: list[BatchRequest]) -> list[str]:
+        texts = []
+        for request in requests:
+            request.done.wait()
+            if request.error is not None:
+                raise request.error
+            texts.append(request.text)
+        return texts
+
+    def close(self):
+        """
+        Stops the batcher threads, failing the queued requests and cancelling the
+        running ones. Blocks until the running batches stop.
+        """
+        with self._condition:
+            self._closed = True
+            queued = list(self._queue)
+            self._queue.clear()
+            for request in self._running:
+                request.cancelEvent.set()
+            self._condition.notify_all()
+        for request in queued:
+            request.error = RuntimeError("The batcher is closed")
+            request.done.set()
+        for thread in self._threads:
+            if thread is not current_thread():
+                thread.join()
+
+    def stats(self) -> dict:
+        return {
+            "batches": self.batches,
+            "requests": self.requests,
+            "meanBatchSize": self.requests / max(self.batches, 1),
+            "queued": len(self._queue),
+        }
+
+    # ------------------------------ Helper Functions ------------------------------- #
+
+    def runBatch(
+        self,
+        images: list[Image.Image],
+        cancelEvents: list[Event],
+        onProgress: Optional[ProgressCallback] = None,
+    ) -> list[str]:
+        return self.engine.ocrBatch(images, cancelEvents, onProgress)
+
+    def batchRunners(
+        self,
+    ) -> list[BatchRunner]:
+        """
+        Returns one function per batcher thread, each running batches on its own
+        """
+        return [self.runBatch]
+
+    def _nextBatch(self) -> Optional[list[BatchRequest]]:
+        """
+        Waits for the next batch and marks it as running, or returns None once closed
+        """
+        with self._condition:
+            while not self._queue and not self._closed:
+                self._condition.wait()
+            if self._closed:
+                return None
+            count = min(len(self._queue), self.maxBatch)
+            batch = [self._queue.popleft() for _ in range(count)]
+            self._running += batch
+            return batch
+
+    def _dispatchProgress(self, batch: list[BatchRequest], index: int, text: str):
+        callback = batch[index].onProgress
+        if callback is not None:
+            callback(text)
+
+    def _finish(self, requests: list[BatchRequest]):
+        with self._condition:
+            self._running = [r for r in self._running if r not in requests]
+        for request in requests:
+            request.done.set()
+
+    def _run(self, runBatch: BatchRunner):
+        while True:
+            batch = self._nextBatch()
+            if batch is None:
+                break
+            # Requests cancelled while waiting are not worth running
+            self._finish([r for r in batch if r.cancelEvent.is_set()])
+            batch = [r for r in batch if not r.cancelEvent.is_set()]
+            if not batch:
+                continue
+
+            onProgress = None
+            if any(r.onProgress is not None for r in batch):
+                onProgress = partial(self._dispatchProgress, batch)
+
+            try:
+                with tracer.span("ocrBatch"):
+                    texts = runBatch(
+                        [r.image for r in batch],
+                        [r.cancelEvent for r in batch],
+                        onProgress,
+                    )
+                for request, text in zip(batch, texts):
+                    request.text = text
+            except Exception as e:
+                for request in batch:
+                    request.error = e
+            finally:
+                with self._condition:
+                    self.batches += 1
+                    self.requests += len(batch)
+                self._finish(batch)
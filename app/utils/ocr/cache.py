@@ -0,0 +1,206 @@
+"""
+Cloe OCR Pipeline
+
+Copyright (C) `2021-2022` `<Alarcon Ace Belen>`
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <http://www.gnu.org/licenses/>.
+"""
+
+import sqlite3
+from collections import OrderedDict
+from hashlib import blake2b
+from threading import Lock
+from typing import Optional
+
+import numpy as np
+from PIL import Image
+
+
+class OCRCache:
+    """Content-addressed LRU cache of OCR results
+
+    Args:
+        maxEntries (int, optional): Maximum number of results kept in memory.
+        Defaults to 256.
+        maxBytes (int, optional): Maximum size of the results kept in memory.
+        Defaults to 1 MiB.
+        perceptual (bool, optional): Match crops by perceptual hash instead of their
+        exact content, which tolerates a few pixels of border jitter. Defaults to False.
+        path (str, optional): Path to an sqlite file used as a persistent tier.
+        Defaults to None, which keeps the results in memory only.
+        maxDiskEntries (int, optional): Maximum number of results kept on disk.
+        Defaults to 10000.
+        namespace (str, optional): Prefix of the keys, identifying the engine that
+        produced the results, see cacheNamespace. Defaults to "".
+    """
+
+    # Maximum differing bits of two perceptual hashes considered the same crop
+    HASH_DISTANCE = 4
+    # Maximum difference in width or height of two crops considered the same crop
+    SIZE_DISTANCE = 4
+
+    def __init__(
+        self,
+        maxEntries=256,
+        maxBytes=1 << 20,
+        perceptual=False,
+        path: Optional[str] = None,
+        maxDiskEntries=10000,
+        namespace="",
+    ):
+        self.maxEntries = maxEntries
+        self.maxBytes = maxBytes
+        self.perceptual = perceptual
+        self.maxDiskEntries = maxDiskEntries
+        self.namespace = namespace
+
+        # key -> (text, width, height, perceptual hash)
+        self._entries: OrderedDict[str, tuple[str, int, int, int]] = OrderedDict()
+        self._bytes = 0
+        self._lock = Lock()
+
+        self.hits = 0
+        self.misses = 0
+        self.diskHits = 0
+
+        self._db = None
+        if path:
+            self._db = sqlite3.connect(path, check_same_thread=False)
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS cache (key TEXT PRIMARY KEY, text TEXT)"
+            )
+            self._db.commit()
+
+    # ------------------------------------ Hashing ---------------------------------- #
+
+    @staticmethod
+    def perceptualHash(image: Image.Image) -> int:
+        """
+        Computes a 64-bit difference hash of the image
+        """
+        pixels = np.asarray(image.convert("L").resize((9, 8), Image.BILINEAR))
+        bits = (pixels[:, 1:] > pixels[:, :-1]).flatten()
+        return int.from_bytes(np.packbits(bits).tobytes(), "big")
+
+    def key(self, image: Image.Image) -> tuple[str, int]:
+        """
+        Returns the cache key and the perceptual hash (0 if unused) of the image
+        """
+        w, h = image.size
+        if self.perceptual:
+            phash = self.perceptualHash(image)
+            # Coarse size buckets keep crops of unrelated sizes apart on disk
+            return f"{self.namespace}|p:{w // 8}x{h // 8}:{phash:016x}", phash
+        digest = blake2b(image.tobytes(), digest_size=16).hexdigest()
+        return f"{self.namespace}|{w}x{h}:{digest}", 0
+
+    # ------------------------------------ Access ----------------------------------- #
+
+    def get(self, image: Image.Image) -> Optional[str]:
+        """
+        Returns the cached text of the image, or None on a miss
+        """
+        key, phash = self.key(image)
+        with self._lock:
+            if self.perceptual:
+                key = self._findSimilar(phash, *image.size) or key
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return self._entries[key][0]
+
+            text = self._getFromDisk(key)
+            if text is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            self.diskHits += 1
+            self._add(key, text, *image.size, phash)
+            return text
+
+    def put(self, image: Image.Image, text: str):
+        key, phash = self.key(image)
+        with self._lock:
+            self._add(key, text, *image.size, phash)
+            self._putToDisk(key, text)
+
+    def clear(self):
+        """
+        Removes every result, including those on disk
+        """
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+            if self._db is not None:
+                self._db.execute("DELETE FROM cache")
+                self._db.commit()
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "diskHits": self.diskHits,
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+            }
+
+    # ------------------------------ Helper Functions ------------------------------- #
+
+    def _add(self, key: str, text: str, width: int, height: int, phash: int):
+        if key in self._entries:
+            self._bytes -= self._size(key, self._entries[key][0])
+        self._entries[key] = (text, width, height, phash)
+        self._entries.move_to_end(key)
+        self._bytes += self._size(key, text)
+
+        while self._entries and (
+            len(self._entries) > self.maxEntries or self._bytes > self.maxBytes
+        ):
+            oldKey, (oldText, *_) = self._entries.popitem(last=False)
+            self._bytes -= self._size(oldKey, oldText)
+
+    def _findSimilar(self, phash: int, width: int, height: int) -> Optional[str]:
+        for key, (_, w, h, other) in reversed(self._entries.items()):
+            if (
+                abs(w - width) <= self.SIZE_DISTANCE
+                and abs(h - height) <= self.SIZE_DISTANCE
+                and bin(phash ^ other).count("1") <= self.HASH_DISTANCE
+            ):
+                return key
+        return None
+
+    def _getFromDisk(self, key: str) -> Optional[str]:
+        if self._db is None:
+            return None
+        row = self._db.execute(
+            "SELECT text FROM cache WHERE key = ?", (key,)
+        ).fetchone()
+        return row[0] if row else None
+
+    def _putToDisk(self, key: str, text: str):
+        if self._db is None:
+            return
+        self._db.execute("INSERT OR REPLACE INTO cache VALUES (?, ?)", (key, text))
+        # Rows are replaced on every write, so the lowest rowids are the oldest
+        self._db.execute(
+            "DELETE FROM cache WHERE rowid NOT IN "
+            "(SELECT rowid FROM cache ORDER BY rowid DESC LIMIT ?)",
+            (self.maxDiskEntries,),
+        )
+        self._db.commit()
+
+    @staticmethod
+    def _size(key: str, text: str) -> int:
+        return len(key) + len(text.encode("utf-8"))
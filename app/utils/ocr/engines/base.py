@@ -0,0 +1,118 @@
+"""
+Cloe OCR Engines
+
+Copyright (C) `2021-2022` `<Alarcon Ace Belen>`
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <http://www.gnu.org/licenses/>.
+"""
+
+import sys
+from threading import Event
+from typing import Any, Callable, Optional
+
+from PIL import Image
+
+from ..streaming import ProgressCallback
+from ..warmup import warmupModel
+
+
+def residentKB() -> int:
+    """
+    Returns the current resident memory of the process in KB, or its peak where
+    the current one is not available, or 0 where neither is
+    """
+    try:
+        with open("/proc/self/status", "r") as fh:
+            for line in fh:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1])
+    except OSError:
+        pass
+
+    try:
+        import resource
+    except ImportError:
+        return 0
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Reported in bytes on macOS
+    return peak // 1024 if sys.platform == "darwin" else peak
+
+
+class BaseEngine:
+    """Model converting images of Japanese text to text
+
+    Subclasses load their model when created and implement ocrBatch. Engines are
+    not thread-safe, run them from one thread such as the MicroBatcher's.
+
+    Args:
+        **options: Engine specific options, kept to recreate the engine in
+        another process.
+    """
+
+    name = "base"
+
+    def __init__(self, **options):
+        self.options = options
+
+    def ocr(
+        self,
+        image: Image.Image,
+        cancelEvent: Optional[Event] = None,
+        onProgress: Optional[Callable[[str], None]] = None,
+    ) -> str:
+        """
+        Converts the image to text. Setting the cancelEvent stops the engine early,
+        returning the text generated so far. onProgress is called with the partial
+        text as it is generated.
+        """
+        cancelEvents = [cancelEvent] if cancelEvent is not None else None
+        if onProgress is None:
+            return self.ocrBatch([image], cancelEvents)[0]
+        return self.ocrBatch([image], cancelEvents, lambda i, text: onProgress(text))[0]
+
+    def ocrBatch(
+        self,
+        images: list[Image.Image],
+        cancelEvents: Optional[list[Event]] = None,
+        onProgress: Optional[ProgressCallback] = None,
+    ) -> list[str]:
+        """Converts the images to text in a single batch
+
+        Args:
+            images (list[Image]): Images to convert.
+            cancelEvents (list[Event], optional): The engine stops early once all of
+            them are set. Defaults to None.
+            onProgress (ProgressCallback, optional): Called with the partial texts
+            as they are generated. Defaults to None.
+        """
+        raise NotImplementedError
+
+    def warmup(self, iterations=1) -> float:
+        """
+        Runs synthetic images to pay the one-time costs early, returning the seconds
+        it took
+        """
+        return warmupModel(self.ocrBatch, iterations)
+
+    def memoryUsage(self) -> dict[str, Any]:
+        """
+        Returns the resident memory of the process and the size of the model in MB
+        """
+        return {
+            "residentMB": residentKB() / 1024,
+            "modelMB": self.modelBytes() / 2**20,
+        }
+
+    def modelBytes(self) -> int:
+        return 0
@@ -0,0 +1,63 @@
+"""
+Cloe OCR Engines
+
+Copyright (C) `2021-2022` `<Alarcon Ace Belen>`
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <http://www.gnu.org/licenses/>.
+"""
+
+# This module imports torch, so import it only where it is used
+
+from threading import Event
+from typing import Optional
+
+import torch
+from PIL import Image
+
+from .base import BaseEngine
+from ..generation import generateBatch
+from ..precision import loadModel
+from ..streaming import ProgressCallback
+
+
+class MangaOcrEngine(BaseEngine):
+    """Engine running the MangaOCR model with PyTorch
+
+    Args:
+        precision (str, optional): Precision of the model on the CPU, see
+        loadModel. Defaults to "fp32".
+    """
+
+    name = "manga_ocr"
+
+    def __init__(self, precision="fp32"):
+        super().__init__(precision=precision)
+        self.model, self.precision = loadModel(precision)
+
+    def ocrBatch(
+        self,
+        images: list[Image.Image],
+        cancelEvents: Optional[list[Event]] = None,
+        onProgress: Optional[ProgressCallback] = None,
+    ) -> list[str]:
+        return generateBatch(self.model, images, cancelEvents, onProgress)
+
+    def modelBytes(self) -> int:
+        # Quantized linear layers keep their weights as packed tuples
+        total = 0
+        for value in self.model.model.state_dict().values():
+            for tensor in value if isinstance(value, tuple) else (value,):
+                if isinstance(tensor, torch.Tensor):
+                    total += tensor.numel() * tensor.element_size()
+        return total
@@ -0,0 +1,80 @@
+"""
+Cloe OCR Engines
+
+Copyright (C) `2021-2022` `<Alarcon Ace Belen>`
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <http://www.gnu.org/licenses/>.
+"""
+
+from importlib import import_module
+from typing import Any
+
+from .base import BaseEngine
+from ..batching import BatchRunner
+from ..revision import modelRevision
+
+# Engine names and their module and class. The module of the real model imports
+# torch, so it is only imported when the engine is used.
+ENGINES = {
+    "manga_ocr": ("mangaocr", "MangaOcrEngine"),
+    "stub": ("stub", "StubEngine"),
+}
+
+
+def getEngine(name: str) -> type[BaseEngine]:
+    """Imports and returns the engine class with the given name
+
+    Args:
+        name (str): Name of the engine.
+    """
+    if name not in ENGINES:
+        raise ValueError(f"Unknown engine {name}, expected one of {list(ENGINES)}")
+    module, className = ENGINES[name]
+    return getattr(import_module(f".{module}", __package__), className)
+
+
+def createEngine(name: str, **options) -> BaseEngine:
+    return getEngine(name)(**options)
+
+
+def engineOptions(name: str, config: dict[str, Any]) -> dict[str, Any]:
+    """
+    Returns the options of the engine from the OCR settings
+    """
+    if name == "manga_ocr":
+        return {"precision": config["precision"]}
+    if name == "stub":
+        return {
+            "latencyMs": config["stubLatencyMs"],
+            "perImageMs": config["stubPerImageMs"],
+        }
+    return {}
+
+
+def cacheNamespace(name: str, options: dict[str, Any]) -> str:
+    """
+    Returns the prefix of the OCR cache keys of the engine, so that results of
+    another engine, precision or model revision are never reused
+    """
+    settings = ",".join(f"{key}={value}" for key, value in sorted(options.items()))
+    return f"{name}[{settings}]@{modelRevision()}"
+
+
+def loadEngine(name: str, warmupIterations: int = 1, **options) -> BatchRunner:
+    """
+    Creates and warms up the engine, for use as the loader of an OCR process
+    """
+    engine = createEngine(name, **options)
+    engine.warmup(warmupIterations)
+    return engine.ocrBatch
@@ -0,0 +1,98 @@
+"""
+Cloe OCR Engines
+
+Copyright (C) `2021-2022` `<Alarcon Ace Belen>`
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <http://www.gnu.org/licenses/>.
+"""
+
+import hashlib
+from threading import Event
+from time import perf_counter, sleep
+from typing import Optional
+
+from PIL import Image
+
+from .base import BaseEngine
+from ..streaming import ProgressCallback
+
+# Characters of the fake texts
+STUB_CHARACTERS = "アイウエオカキクケコサシスセソタチツテトナニヌネノハヒフヘホマミムメモ"
+
+
+class StubEngine(BaseEngine):
+    """Engine returning fake texts after a fixed latency, without any model
+
+    The text of an image only depends on its pixels, so results are deterministic
+    and repeatable. The latency is spread over one step per character, checking
+    for cancellation and reporting the partial texts between steps like the real
+    decoder does.
+
+    Args:
+        latencyMs (float, optional): Time spent per batch. Defaults to 50.
+        perImageMs (float, optional): Time spent per image of the batch.
+        Defaults to 20.
+        busy (bool, optional): Spend the time computing in Python while holding
+        the GIL, like the real model partly does, instead of sleeping.
+        Defaults to False.
+    """
+
+    name = "stub"
+
+    def __init__(self, latencyMs=50.0, perImageMs=20.0, busy=False):
+        super().__init__(latencyMs=latencyMs, perImageMs=perImageMs, busy=busy)
+        self.latency = latencyMs / 1000
+        self.perImage = perImageMs / 1000
+        self.busy = busy
+
+    def ocrBatch(
+        self,
+        images: list[Image.Image],
+        cancelEvents: Optional[list[Event]] = None,
+        onProgress: Optional[ProgressCallback] = None,
+    ) -> list[str]:
+        if not images:
+            return []
+
+        texts = [self.stubText(image) for image in images]
+        steps = max(len(text) for text in texts)
+        stepTime = (self.latency + self.perImage * len(images)) / steps
+        for step in range(1, steps + 1):
+            self.wait(stepTime)
+            if onProgress is not None:
+                for i, text in enumerate(texts):
+                    if step <= len(text):
+                        onProgress(i, text[:step])
+            if cancelEvents and all(e.is_set() for e in cancelEvents):
+                return [text[:step] for text in texts]
+        return texts
+
+    # ------------------------------ Helper Functions ------------------------------- #
+
+    def stubText(self, image: Image.Image) -> str:
+        thumbnail = image.convert("L").resize((16, 16))
+        digest = hashlib.md5(thumbnail.tobytes()).digest()
+        length = 4 + digest[0] % 12
+        return "".join(
+            STUB_CHARACTERS[digest[i % len(digest)] % len(STUB_CHARACTERS)]
+            for i in range(1, length + 1)
+        )
+
+    def wait(self, seconds: float):
+        if not self.busy:
+            sleep(seconds)
+            return
+        end = perf_counter() + seconds
+        while perf_counter() < end:
+            sum(range(100))
@@ -0,0 +1,92 @@
+"""
+Cloe OCR Pipeline
+
+Copyright (C) `2021-2022` `<Alarcon Ace Belen>`
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <http://www.gnu.org/licenses/>.
+"""
+
+from threading import Lock
+from typing import Optional
+
+import numpy as np
+from PIL import Image
+
+
+class ContentGate:
+    """Rejects crops that clearly hold no text before they reach the model
+
+    A crop is rejected if it is too small, if too few of its pixels stand out from
+    its background, or if its gray levels hardly vary. The background is taken as
+    the median gray level, so dark text on light and light text on dark pass alike.
+
+    Args:
+        minSide (int, optional): Minimum width and height in pixels. Defaults to 10.
+        minInkRatio (float, optional): Minimum fraction of ink pixels. Defaults to
+        0.005.
+        inkContrast (int, optional): Minimum difference in gray levels between an
+        ink pixel and the background. Defaults to 48.
+        minStd (float, optional): Minimum standard deviation of the gray levels.
+        Defaults to 6.0.
+    """
+
+    REASONS = ("size", "ink", "variance")
+
+    def __init__(self, minSide=10, minInkRatio=0.005, inkContrast=48, minStd=6.0):
+        self.minSide = minSide
+        self.minInkRatio = minInkRatio
+        self.inkContrast = inkContrast
+        self.minStd = minStd
+
+        self._lock = Lock()
+        self.passed = 0
+        self.gated = {reason: 0 for reason in self.REASONS}
+
+    def accepts(self, image: Image.Image) -> bool:
+        """
+        Returns whether the image may hold text, counting the result
+        """
+        reason = self.reject(image)
+        with self._lock:
+            if reason is None:
+                self.passed += 1
+            else:
+                self.gated[reason] += 1
+        return reason is None
+
+    def reject(self, image: Image.Image) -> Optional[str]:
+        """
+        Returns why the image holds no text, or None if it may hold some
+        """
+        if min(image.size) < self.minSide:
+            return "size"
+        # Every statistic is taken from the histogram of the gray levels
+        histogram = np.bincount(np.asarray(image.convert("L")).ravel(), minlength=256)
+        count = histogram.sum()
+        levels = np.arange(256)
+
+        background = np.searchsorted(np.cumsum(histogram), count / 2)
+        ink = np.abs(levels - background) >= self.inkContrast
+        if histogram[ink].sum() < self.minInkRatio * count:
+            return "ink"
+
+        mean = (histogram * levels).sum() / count
+        variance = (histogram * (levels - mean) ** 2).sum() / count
+        if variance < self.minStd**2:
+            return "variance"
+        return None
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {"passed": self.passed, "gated": dict(self.gated)}
@@ -0,0 +1,98 @@
+"""
+Cloe OCR Pipeline
+
+Copyright (C) `2021-2022` `<Alarcon Ace Belen>`
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <http://www.gnu.org/licenses/>.
+"""
+
+# This module imports torch and transformers, so import it only where it is used
+
+from threading import Event
+from typing import Optional
+
+import torch
+from manga_ocr import MangaOcr
+from manga_ocr.ocr import post_process
+from PIL import Image
+from transformers import StoppingCriteria, StoppingCriteriaList
+
+from .streaming import ProgressCallback, TextStream
+
+
+class CancelCriteria(StoppingCriteria):
+    """Stops the generation between decoder steps once every event is set
+
+    Args:
+        cancelEvents (list[Event]): Events set to cancel the generation
+    """
+
+    def __init__(self, cancelEvents: list[Event]):
+        self.cancelEvents = cancelEvents
+
+    def __call__(self, input_ids, scores, **kwargs) -> bool:
+        return all(e.is_set() for e in self.cancelEvents)
+
+
+class ProgressCriteria(StoppingCriteria):
+    """Never stops the generation, only reports the texts after each decoder step
+
+    Args:
+        stream (TextStream): Stream the tokens so far are put into.
+    """
+
+    def __init__(self, stream: TextStream):
+        self.stream = stream
+
+    def __call__(self, input_ids, scores, **kwargs) -> bool:
+        self.stream.put(input_ids.tolist())
+        return False
+
+
+def generateBatch(
+    model: MangaOcr,
+    images: list[Image.Image],
+    cancelEvents: Optional[list[Event]] = None,
+    onProgress: Optional[ProgressCallback] = None,
+) -> list[str]:
+    """Convert images to text using the model in a single padded batch
+
+    Args:
+        model (MangaOcr): Loaded MangaOCR model.
+        images (list[Image]): Images to convert.
+        cancelEvents (list[Event], optional): The generation stops early once all
+        of them are set. Defaults to None.
+        onProgress (ProgressCallback, optional): Called with the partial texts as
+        tokens are generated. Defaults to None.
+    """
+    if not images:
+        return []
+
+    pixelValues = torch.stack(
+        [model._preprocess(image.convert("L").convert("RGB")) for image in images]
+    )
+    stoppingCriteria = StoppingCriteriaList()
+    if cancelEvents:
+        stoppingCriteria.append(CancelCriteria(cancelEvents))
+    if onProgress is not None:
+        stream = TextStream(model.tokenizer, onProgress, post_process)
+        stoppingCriteria.append(ProgressCriteria(stream))
+
+    tokens = model.model.generate(
+        pixelValues.to(model.model.device, model.model.dtype),
+        max_length=300,
+        stopping_criteria=stoppingCriteria,
+    ).cpu()
+    texts = model.tokenizer.batch_decode(tokens, skip_special_tokens=True)
+    return [post_process(text) for text in texts]
@@ -0,0 +1,255 @@
+"""
+Cloe OCR Pipeline
+
+Copyright (C) `2021-2022` `<Alarcon Ace Belen>`
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <http://www.gnu.org/licenses/>.
+"""
+
+# This module imports torch, so import it only where it is used
+
+import logging
+import os
+import re
+from contextlib import contextmanager
+
+import torch
+from manga_ocr import MangaOcr
+from transformers import (
+    AutoFeatureExtractor,
+    AutoModel,
+    AutoModelForCausalLM,
+    AutoTokenizer,
+    VisionEncoderDecoderConfig,
+    VisionEncoderDecoderModel,
+)
+from transformers.modeling_utils import no_init_weights
+
+from utils.constants import MODEL_CACHE
+
+from .revision import MODEL_NAME, modelRevision
+
+logger = logging.getLogger(__name__)
+
+PRECISIONS = ("fp32", "int8", "bf16")
+
+# State dict entries of the quantized linear layers
+PACKED_PARAMS = "_packed_params._packed_params"
+PACKED_DTYPE = "_packed_params.dtype"
+
+
+def supportsBF16() -> bool:
+    """
+    Returns whether the CPU has native bf16 instructions, without which bf16 is
+    slower than fp32
+    """
+    try:
+        return torch.ops.mkldnn._is_mkldnn_bf16_supported()
+    except (AttributeError, RuntimeError):
+        return False
+
+
+def cachePath(precision: str, cacheDir: str, modelName: str = MODEL_NAME) -> str:
+    """
+    Returns the path of the weights of the converted model, which depends on the
+    model revision and on the torch version, since the packed quantized weights are
+    not portable across versions
+    """
+    name = re.sub(r"[^\w.-]", "_", f"{modelName}-{modelRevision()}")
+    return os.path.join(
+        cacheDir, f"{name}-{precision}-torch{torch.__version__}.state.pt"
+    )
+
+
+def quantize(model: torch.nn.Module) -> torch.nn.Module:
+    # In place, since a copy would hold the fp32 weights twice
+    return torch.quantization.quantize_dynamic(
+        model, {torch.nn.Linear}, dtype=torch.qint8, inplace=True
+    )
+
+
+@contextmanager
+def skipInit():
+    """
+    Turns the torch.nn.init functions into no-ops, so that layers created in the
+    block keep their memory uninitialized, and so not resident, until loaded
+    """
+    names = [n for n in dir(torch.nn.init) if n.endswith("_") and not n.startswith("_")]
+    originals = {name: getattr(torch.nn.init, name) for name in names}
+    try:
+        for name in names:
+            setattr(torch.nn.init, name, lambda tensor, *args, **kwargs: tensor)
+        yield
+    finally:
+        for name, function in originals.items():
+            setattr(torch.nn.init, name, function)
+
+
+def emptyQuantized(model: torch.nn.Module) -> torch.nn.Module:
+    """
+    Replaces the linear layers in place with int8 layers of the same shape, like
+    quantize does, without quantizing weights that are about to be loaded
+    """
+    for module in list(model.modules()):
+        for name, child in list(module.named_children()):
+            if type(child) is torch.nn.Linear:
+                layer = torch.ao.nn.quantized.dynamic.Linear(
+                    child.in_features, child.out_features, bias_=child.bias is not None
+                )
+                setattr(module, name, layer)
+    return model
+
+
+def saveQuantized(model: torch.nn.Module, path: str):
+    """Saves the weights of the int8 model as plain tensors
+
+    torch.load with weights_only rejects quantized tensors, so the packed weights
+    of each quantized layer are saved as their int8 values, scale and zero point.
+
+    Args:
+        model (Module): Model quantized by convertModel.
+        path (str): Path of the weights.
+    """
+    state = {}
+    for key, value in model.state_dict().items():
+        if key.endswith(PACKED_DTYPE):
+            # Always qint8, set again by quantize
+            continue
+        if key.endswith(PACKED_PARAMS):
+            weight, bias = value
+            if weight.qscheme() != torch.per_tensor_affine:
+                raise ValueError(f"Unsupported quantization of {key}")
+            state[f"{key}.int8"] = weight.int_repr()
+            state[f"{key}.scale"] = torch.tensor(weight.q_scale())
+            state[f"{key}.zeroPoint"] = torch.tensor(weight.q_zero_point())
+            if bias is not None:
+                state[f"{key}.bias"] = bias
+            continue
+        state[key] = value
+    torch.save(state, path)
+
+
+def loadQuantized(path: str, modelName: str = MODEL_NAME) -> torch.nn.Module:
+    """Builds the int8 model from its config and the cached weights
+
+    The fp32 checkpoint is never read. The encoder and the decoder are created
+    without initializing their weights, and their linear layers are replaced with
+    empty int8 layers one at a time, so the fp32 weights are never filled in.
+
+    Args:
+        path (str): Weights saved by convertModel.
+        modelName (str, optional): Name or path of the pretrained model, for its
+        config. Defaults to MODEL_NAME.
+    """
+    config = VisionEncoderDecoderConfig.from_pretrained(modelName)
+    with no_init_weights(), skipInit():
+        encoder = emptyQuantized(AutoModel.from_config(config.encoder))
+        decoder = emptyQuantized(AutoModelForCausalLM.from_config(config.decoder))
+        model = emptyQuantized(
+            VisionEncoderDecoderModel(config=config, encoder=encoder, decoder=decoder)
+        )
+    # Tensors only, nothing is unpickled as code
+    saved = torch.load(path, weights_only=True)
+    # Filled in place, since its metadata holds the versions of the layer formats
+    state = model.state_dict()
+    for key in state:
+        if key.endswith(PACKED_DTYPE):
+            continue
+        if key.endswith(PACKED_PARAMS):
+            weight = torch._make_per_tensor_quantized_tensor(
+                saved.pop(f"{key}.int8"),
+                saved.pop(f"{key}.scale").item(),
+                saved.pop(f"{key}.zeroPoint").item(),
+            )
+            state[key] = (weight, saved.pop(f"{key}.bias", None))
+        else:
+            state[key] = saved.pop(key)
+    if saved:
+        raise KeyError(f"Unexpected weights {list(saved)[:3]}")
+    model.load_state_dict(state)
+    return model.eval()
+
+
+def loadModel(
+    precision: str = "fp32", cacheDir: str = MODEL_CACHE
+) -> tuple[MangaOcr, str]:
+    """Loads the MangaOCR model in the given precision, see convertModel
+
+    An int8 model converted by a previous run is built from its cached weights,
+    without loading the fp32 model first.
+
+    Args:
+        precision (str, optional): One of PRECISIONS. Defaults to "fp32".
+        cacheDir (str, optional): Directory of the converted models.
+        Defaults to MODEL_CACHE.
+
+    Returns:
+        tuple[MangaOcr, str]: Loaded model and the precision actually used.
+    """
+    path = cachePath(precision, cacheDir)
+    # MangaOcr runs on the GPU when there is one, where int8 does not apply
+    if precision == "int8" and not torch.cuda.is_available() and os.path.exists(path):
+        try:
+            model = loadQuantized(path)
+        except Exception as e:
+            # Converted again by convertModel, replacing the unreadable file
+            logger.warning("Could not load the int8 model from %s: %s", path, e)
+        else:
+            ocr = MangaOcr.__new__(MangaOcr)
+            ocr.feature_extractor = AutoFeatureExtractor.from_pretrained(MODEL_NAME)
+            ocr.tokenizer = AutoTokenizer.from_pretrained(MODEL_NAME)
+            ocr.model = model
+            return ocr, precision
+
+    ocr = MangaOcr()
+    return ocr, convertModel(ocr, precision, cacheDir)
+
+
+def convertModel(
+    model: MangaOcr, precision: str = "fp32", cacheDir: str = MODEL_CACHE
+) -> str:
+    """Converts the model in place to the given precision on the CPU
+
+    int8 applies dynamic quantization to the linear layers of the encoder and the
+    decoder. The quantized weights are cached on disk for loadModel, so the model
+    is only converted once. bf16 casts the weights, and falls back to fp32 if the
+    CPU lacks bf16 support.
+
+    Args:
+        model (MangaOcr): Loaded MangaOCR model, in fp32.
+        precision (str, optional): One of PRECISIONS. Defaults to "fp32".
+        cacheDir (str, optional): Directory of the converted models.
+        Defaults to MODEL_CACHE.
+
+    Returns:
+        str: Precision actually used.
+    """
+    if precision not in PRECISIONS:
+        raise ValueError(f"Unknown precision {precision}, expected one of {PRECISIONS}")
+    if precision == "fp32" or model.model.device.type != "cpu":
+        return "fp32"
+
+    if precision == "bf16":
+        if not supportsBF16():
+            return "fp32"
+        model.model = model.model.to(torch.bfloat16)
+        return precision
+
+    model.model = quantize(model.model)
+    try:
+        os.makedirs(cacheDir, exist_ok=True)
+        saveQuantized(model.model, cachePath(precision, cacheDir))
+    except OSError as e:
+        logger.warning("Could not cache the int8 model: %s", e)
+    return precision
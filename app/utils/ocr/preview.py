@@ -0,0 +1,75 @@
+"""
+Cloe OCR Pipeline
+
+Copyright (C) `2021-2022` `<Alarcon Ace Belen>`
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <http://www.gnu.org/licenses/>.
+"""
+
+# When previews run while the selection is dragged: every interval while it moves,
+# once it stops moving for the interval, or never, converting only on release
+PREVIEW_MODES = ("live", "pause", "release")
+
+
+class PreviewPolicy:
+    """Decides when previews run, learning the interval from their latency
+
+    The interval follows a moving average of the preview latency, from the request
+    to the text shown, within the bounds. Fast machines then show previews sooner,
+    while slow ones do not start previews faster than the model finishes them.
+
+    Args:
+        mode (str, optional): One of PREVIEW_MODES. Defaults to "pause".
+        minInterval (int, optional): Shortest interval in ms. Defaults to 100.
+        maxInterval (int, optional): Longest interval in ms. Defaults to 800.
+        latency (float, optional): Latency in ms assumed until previews are
+        measured. Defaults to 300.
+    """
+
+    # Weight of the latest latency in the moving average
+    SMOOTHING = 0.3
+
+    def __init__(self, mode="pause", minInterval=100, maxInterval=800, latency=300.0):
+        if mode not in PREVIEW_MODES:
+            raise ValueError(f"Unknown preview mode: {mode}")
+        self.mode = mode
+        self.minInterval = minInterval
+        self.maxInterval = max(maxInterval, minInterval)
+        self.latency = latency
+        self.measured = 0
+
+    def interval(self) -> int:
+        """
+        Returns the interval in ms before a preview starts, or between previews
+        """
+        return round(min(max(self.latency, self.minInterval), self.maxInterval))
+
+    def record(self, latency: float):
+        """Updates the moving average with the latency of a preview
+
+        Args:
+            latency (float): Time in ms from the request to the text shown.
+        """
+        # The first latency replaces the assumed one
+        weight = self.SMOOTHING if self.measured else 1.0
+        self.latency += weight * (latency - self.latency)
+        self.measured += 1
+
+    def stats(self) -> dict:
+        return {
+            "mode": self.mode,
+            "latencyMs": self.latency,
+            "intervalMs": self.interval(),
+            "measured": self.measured,
+        }
@@ -0,0 +1,328 @@
+"""
+Cloe OCR Pipeline
+
+Copyright (C) `2021-2022` `<Alarcon Ace Belen>`
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <http://www.gnu.org/licenses/>.
+"""
+
+import atexit
+import multiprocessing
+import os
+import sys
+from multiprocessing import resource_tracker
+from multiprocessing.connection import Connection
+from multiprocessing.shared_memory import SharedMemory
+from threading import Event, Thread
+from time import monotonic
+from typing import Callable, Optional
+
+from PIL import Image
+
+from .batching import BatchRunner, MicroBatcher
+from .streaming import ProgressCallback
+
+# Returns the function run by the OCR process on each batch of images
+ModelLoader = Callable[[], BatchRunner]
+
+
+def serveModel(
+    connection: Connection, cancelEvent, loadModel: ModelLoader, threads: int = 0
+):
+    """Entry point of the OCR process
+
+    Reads the images of each batch from the shared memory block named in the
+    request, and sends back the texts over the connection, preceded by the partial
+    texts if the request asks for them.
+
+    Args:
+        connection (Connection): Child end of the pipe to the app.
+        cancelEvent (multiprocessing.Event): Set by the app to stop the generation.
+        loadModel (ModelLoader): Function returning the batch function. Must be
+        picklable, unless the process is forked.
+        threads (int, optional): Number of torch threads, 0 keeps the default.
+        Defaults to 0.
+    """
+    try:
+        if threads:
+            # Read by torch when imported, or set directly if it was inherited
+            os.environ["OMP_NUM_THREADS"] = str(threads)
+            if "torch" in sys.modules:
+                sys.modules["torch"].set_num_threads(threads)
+        runBatch = loadModel()
+    except Exception as e:
+        connection.send(("error", str(e)))
+        return
+    connection.send(("ready", None))
+
+    memory: Optional[SharedMemory] = None
+    while True:
+        try:
+            name, sizes, stream = connection.recv()
+        except EOFError:
+            break
+
+        if memory is None or memory.name != name:
+            if memory is not None:
+                memory.close()
+            memory = SharedMemory(name)
+
+        images = []
+        offset = 0
+        for size in sizes:
+            length = size[0] * size[1] * 3
+            data = memory.buf[offset : offset + length]
+            images.append(Image.frombytes("RGB", size, data))
+            data.release()
+            offset += length
+
+        try:
+            if stream:
+                texts = runBatch(
+                    images,
+                    [cancelEvent],
+                    lambda i, text: connection.send(("progress", (i, text))),
+                )
+            else:
+                texts = runBatch(images, [cancelEvent])
+            connection.send(("result", texts))
+        except Exception as e:
+            connection.send(("error", str(e)))
+
+    if memory is not None:
+        memory.close()
+
+
+class ModelProcess:
+    """OCR process converting the batches sent by the app
+
+    Images are copied into a shared memory block instead of being pickled, and
+    the texts come back over a pipe. The process is restarted if it exits, and if
+    the restart fails, the next batch tries again once the backoff has passed.
+    Batches must be run from one thread at a time.
+
+    Args:
+        loadModel (ModelLoader): Function called in the process to load the model.
+        method (str, optional): Multiprocessing start method. Defaults to "spawn".
+        threads (int, optional): Number of torch threads. Defaults to 0.
+        reloadModel (ModelLoader, optional): Picklable function loading the model
+        in a spawned process, which then replaces the process if it exits. Defaults
+        to None, restarting it like it was started.
+    """
+
+    # Seconds before retrying a failed restart, doubled after each failure
+    RETRY_DELAY = 1.0
+    MAX_RETRY_DELAY = 30.0
+
+    def __init__(
+        self,
+        loadModel: ModelLoader,
+        method="spawn",
+        threads=0,
+        reloadModel: Optional[ModelLoader] = None,
+    ):
+        self.loadModel = loadModel
+        self.threads = threads
+        self.reloadModel = reloadModel
+        self.restarts = 0
+
+        self._context = multiprocessing.get_context(method)
+        self._cancelEvent = self._context.Event()
+        self._process: Optional[multiprocessing.process.BaseProcess] = None
+        self._connection: Optional[Connection] = None
+        self._memory: Optional[SharedMemory] = None
+        self._ready = Event()
+        self._startError: Optional[Exception] = None
+        self._failedRestarts = 0
+        self._retryAt = 0.0
+
+    def start(self):
+        """
+        Starts the process without waiting for its model, see waitReady
+        """
+        self._ready.clear()
+        self.stop()
+
+        # Started before forking, otherwise a forked process starts its own
+        # tracker, which unlinks the app's shared memory when the process dies
+        resource_tracker.ensure_running()
+
+        connection, childConnection = self._context.Pipe()
+        self._process = self._context.Process(
+            target=serveModel,
+            args=(childConnection, self._cancelEvent, self.loadModel, self.threads),
+            name="Cloe OCR",
+            daemon=True,
+        )
+        self._process.start()
+        childConnection.close()
+        self._connection = connection
+
+    def waitReady(self):
+        """
+        Blocks until the model of the started process is loaded
+        """
+        try:
+            status, message = self._connection.recv()
+            self._startError = None if status == "ready" else RuntimeError(message)
+        except (EOFError, OSError):
+            self._process.join(1)
+            self._startError = RuntimeError(
+                f"The OCR process exited with code {self._process.exitcode}"
+            )
+        self._ready.set()
+        if self._startError is not None:
+            raise self._startError
+
+    def pid(self) -> Optional[int]:
+        return self._process.pid if self._process is not None else None
+
+    def restart(self):
+        """
+        Starts the process again and waits for its model. If that fails, the error
+        is raised by the batches until the backoff has passed.
+        """
+        self.restarts += 1
+        # By now the app runs threads, whose held locks a forked process would copy
+        if self.reloadModel is not None:
+            self.loadModel = self.reloadModel
+            self.reloadModel = None
+            self._context = multiprocessing.get_context("spawn")
+            self._cancelEvent = self._context.Event()
+        self.start()
+        try:
+            self.waitReady()
+        except Exception:
+            self._failedRestarts += 1
+            delay = self.RETRY_DELAY * 2 ** (self._failedRestarts - 1)
+            self._retryAt = monotonic() + min(delay, self.MAX_RETRY_DELAY)
+        else:
+            self._failedRestarts = 0
+
+    def stop(self):
+        if self._connection is not None:
+            self._connection.close()
+            self._connection = None
+        if self._process is not None:
+            self._process.join(1)
+            if self._process.is_alive():
+                self._process.kill()
+            self._process = None
+
+    def close(self):
+        self.stop()
+        if self._memory is not None:
+            self._memory.close()
+            self._memory.unlink()
+            self._memory = None
+
+    def runBatch(
+        self,
+        images: list[Image.Image],
+        cancelEvents: list[Event],
+        onProgress: Optional[ProgressCallback] = None,
+    ) -> list[str]:
+        self._ready.wait()
+        if self._startError is not None and monotonic() >= self._retryAt:
+            self.restart()
+        if self._startError is not None:
+            raise self._startError
+
+        images = [image.convert("RGB") for image in images]
+        name = self.writeImages(images)
+        self._cancelEvent.clear()
+        try:
+            sizes = [image.size for image in images]
+            self._connection.send((name, sizes, onProgress is not None))
+            while True:
+                # Polled, so that cancelling the requests can stop the generation
+                while not self._connection.poll(0.01):
+                    if all(e.is_set() for e in cancelEvents):
+                        self._cancelEvent.set()
+                    if not self._process.is_alive():
+                        raise EOFError
+                status, result = self._connection.recv()
+                if status != "progress":
+                    break
+                onProgress(*result)
+        except (EOFError, OSError):
+            self._ready.clear()
+            Thread(target=self.restart, daemon=True).start()
+            raise RuntimeError("The OCR process exited and is being restarted")
+
+        if status == "error":
+            raise RuntimeError(result)
+        return result
+
+    # ------------------------------ Helper Functions ------------------------------- #
+
+    def writeImages(self, images: list[Image.Image]) -> str:
+        """
+        Copies the images into the shared memory block, growing it as needed
+        """
+        length = sum(image.width * image.height * 3 for image in images)
+        if self._memory is None or self._memory.size < length:
+            if self._memory is not None:
+                self._memory.close()
+                self._memory.unlink()
+            self._memory = SharedMemory(create=True, size=max(length, 1 << 20))
+
+        offset = 0
+        for image in images:
+            data = image.tobytes()
+            self._memory.buf[offset : offset + len(data)] = data
+            offset += len(data)
+        return self._memory.name
+
+
+class ProcessBatcher(MicroBatcher):
+    """MicroBatcher running the model in a separate OCR process
+
+    The app then only holds the GIL for capturing, so the rubber band keeps up
+    while the model runs, and a crash of the model does not close the app.
+
+    Args:
+        loadModel (ModelLoader): Picklable function called in the OCR process to
+        load the model, such as loadEngine with the engine name bound.
+        maxBatch (int, optional): Maximum number of images per batch. Defaults to 16.
+    """
+
+    def __init__(self, loadModel: ModelLoader, maxBatch=16):
+        # Spawned, since forking a process with Qt and torch threads is unsafe
+        self.process = ModelProcess(loadModel)
+        self.process.start()
+        self.process.waitReady()
+        atexit.register(self.close)
+
+        super().__init__(None, maxBatch)
+
+    def close(self):
+        # The batcher thread stops first, or it would restart the stopped process
+        super().close()
+        self.process.close()
+
+    def stats(self) -> dict:
+        stats = super().stats()
+        stats["restarts"] = self.process.restarts
+        return stats
+
+    # ------------------------------ Helper Functions ------------------------------- #
+
+    def runBatch(
+        self,
+        images: list[Image.Image],
+        cancelEvents: list[Event],
+        onProgress: Optional[ProgressCallback] = None,
+    ) -> list[str]:
+        return self.process.runBatch(images, cancelEvents, onProgress)
@@ -0,0 +1,120 @@
+"""
+Cloe OCR Pipeline
+
+Copyright (C) `2021-2022` `<Alarcon Ace Belen>`
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <http://www.gnu.org/licenses/>.
+"""
+
+import atexit
+import gc
+import multiprocessing
+import os
+from functools import partial
+from typing import TYPE_CHECKING, Optional
+
+from .batching import BatchRunner, MicroBatcher
+from .engines import loadEngine
+from .process import ModelProcess
+
+if TYPE_CHECKING:
+    from .engines import BaseEngine
+
+
+def loadReplica(engine: "BaseEngine", warmupIterations: int = 1) -> BatchRunner:
+    """
+    Warms up the engine inherited from the parent, only called in a forked replica
+    """
+    engine.warmup(warmupIterations)
+    return engine.ocrBatch
+
+
+class ReplicaPool(MicroBatcher):
+    """MicroBatcher running batches on several OCR processes at once
+
+    The engine is loaded once by the caller, then each replica is forked from it
+    and shares its weights copy-on-write. Each replica gets an equal share of the
+    cores as torch threads, so they do not oversubscribe the machine. Where fork
+    is not available, each replica loads its own copy of the engine instead, as
+    do the replicas replacing those that crashed.
+
+    Forking is only safe before other threads start, so this is meant for
+    headless use like the batch CLI, not for the tray app.
+
+    Args:
+        engine (BaseEngine): Loaded OCR engine, not yet run from other threads.
+        workers (int, optional): Number of replicas. Defaults to the core count.
+        warmupIterations (int, optional): Warmup passes of each replica. Defaults to 1.
+        maxBatch (int, optional): Maximum number of images per batch. Defaults to 16.
+    """
+
+    def __init__(
+        self,
+        engine: "BaseEngine",
+        workers: Optional[int] = None,
+        warmupIterations=1,
+        maxBatch=16,
+    ):
+        cores = os.cpu_count() or 1
+        workers = workers or cores
+        threads = max(1, cores // workers)
+
+        # Crashed replicas are spawned instead, the app runs threads by then
+        spawnModel = partial(
+            loadEngine, engine.name, warmupIterations, **engine.options
+        )
+        fork = "fork" in multiprocessing.get_all_start_methods()
+        if fork:
+            loadModel = partial(loadReplica, engine, warmupIterations)
+            method = "fork"
+        else:
+            loadModel = spawnModel
+            method = "spawn"
+
+        self.replicas = [
+            ModelProcess(loadModel, method, threads, reloadModel=spawnModel)
+            for _ in range(workers)
+        ]
+        # Keeps the garbage collector of the replicas from writing to, and so
+        # copying, the pages of the objects they inherit. Only frozen while
+        # forking, the app then collects its own objects again.
+        if fork:
+            gc.freeze()
+        try:
+            for replica in self.replicas:
+                replica.start()
+        finally:
+            if fork:
+                gc.unfreeze()
+        for replica in self.replicas:
+            replica.waitReady()
+        atexit.register(self.close)
+
+        super().__init__(engine, maxBatch)
+
+    def close(self):
+        super().close()
+        for replica in self.replicas:
+            replica.close()
+
+    def stats(self) -> dict:
+        stats = super().stats()
+        stats["replicas"] = len(self.replicas)
+        stats["restarts"] = sum(r.restarts for r in self.replicas)
+        return stats
+
+    # ------------------------------ Helper Functions ------------------------------- #
+
+    def batchRunners(self) -> list[BatchRunner]:
+        return [replica.runBatch for replica in self.replicas]
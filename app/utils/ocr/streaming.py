@@ -0,0 +1,58 @@
+"""
+Cloe OCR Pipeline
+
+Copyright (C) `2021-2022` `<Alarcon Ace Belen>`
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <http://www.gnu.org/licenses/>.
+"""
+
+from typing import Any, Callable, Sequence
+
+# Called with the index of an image in the batch and its text decoded so far
+ProgressCallback = Callable[[int, str], None]
+
+
+class TextStream:
+    """Decodes the tokens generated so far, reporting the texts that changed
+
+    Args:
+        tokenizer: Tokenizer of the model, with a batch_decode method.
+        onProgress (ProgressCallback): Called with each text that changed.
+        postProcess (Callable[[str], str]): Cleans up the decoded texts, the same
+        way as the final texts.
+    """
+
+    def __init__(
+        self,
+        tokenizer: Any,
+        onProgress: ProgressCallback,
+        postProcess: Callable[[str], str],
+    ):
+        self.tokenizer = tokenizer
+        self.onProgress = onProgress
+        self.postProcess = postProcess
+        self._texts: dict[int, str] = {}
+
+    def put(self, tokens: Sequence[Sequence[int]]):
+        """Reports the texts of the token rows that changed since the last call
+
+        Args:
+            tokens (Sequence[Sequence[int]]): Tokens so far, one row per image.
+        """
+        texts = self.tokenizer.batch_decode(tokens, skip_special_tokens=True)
+        for i, text in enumerate(texts):
+            text = self.postProcess(text)
+            if text and text != self._texts.get(i):
+                self._texts[i] = text
+                self.onProgress(i, text)
@@ -0,0 +1,66 @@
+"""
+Cloe OCR Pipeline
+
+Copyright (C) `2021-2022` `<Alarcon Ace Belen>`
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <http://www.gnu.org/licenses/>.
+"""
+
+from threading import Event
+from time import perf_counter
+
+from PIL import Image, ImageDraw
+
+from .batching import BatchRunner
+
+# Typical selections, as width by height: a vertical column, a horizontal line
+# and a speech bubble
+WARMUP_SIZES = [(48, 240), (240, 48), (200, 200)]
+
+
+def syntheticImage(size: tuple[int, int]) -> Image.Image:
+    """
+    Draws dark strokes on a white background, roughly like a block of text
+    """
+    width, height = size
+    image = Image.new("RGB", size, "white")
+    draw = ImageDraw.Draw(image)
+    step = 16
+    for x in range(step // 2, width - step // 2, step):
+        for y in range(step // 2, height - step // 2, step):
+            draw.rectangle((x, y, x + step // 2, y + step // 2), fill="black")
+    return image
+
+
+def warmupModel(runBatch: BatchRunner, iterations: int = 1) -> float:
+    """Run synthetic images through the model to pay its one-time costs early
+
+    Both the single image and the batched generation are exercised, since the
+    previews and the multi-region selections take different paths.
+
+    Args:
+        runBatch (BatchRunner): Batch function of the loaded model, such as
+        generateBatch bound to a MangaOCR model.
+        iterations (int, optional): Number of warmup passes. Defaults to 1.
+
+    Returns:
+        float: Duration of the warmup in seconds.
+    """
+    start = perf_counter()
+    images = [syntheticImage(size) for size in WARMUP_SIZES]
+    for _ in range(max(iterations, 0)):
+        for image in images:
+            runBatch([image], [Event()])
+        runBatch(images, [])
+    return perf_counter() - start
@@ -19,5 +19,13 @@ along with this program.  If not, see <http://www.gnu.org/licenses/>.
 
 from .camelizeText import camelizeText
 from .colorToRGBA import colorToRGBA
+from .imageDifference import imageDifference
+from .imagesToText import imagesToText
+from .inkRatio import inkRatio
 from .logText import logText
+from .pixmapToArray import pixmapToArray
+from .pixmapToImage import pixmapToImage
 from .pixmapToText import pixmapToText
+from .pixmapsToText import pixmapsToText
+from .readSettings import readSettings
+from .sortReadingOrder import sortReadingOrder
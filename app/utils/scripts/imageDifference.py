@@ -0,0 +1,45 @@
+"""
+Cloe Helper Functions
+
+Copyright (C) `2021-2022` `<Alarcon Ace Belen>`
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <http://www.gnu.org/licenses/>.
+"""
+
+from typing import Union
+
+import numpy as np
+from PyQt5.QtGui import QImage, QPixmap
+
+from .pixmapToArray import pixmapToArray
+
+
+def imageDifference(a: Union[QPixmap, QImage], b: Union[QPixmap, QImage]) -> float:
+    """Returns how much two images of the same size differ, from 0 for identical
+    pixels to 1
+
+    The difference is the mean absolute difference of the channels, over every
+    other row and column. Images of different sizes differ by 1.
+
+    Args:
+        a (QPixmap | QImage): First image.
+        b (QPixmap | QImage): Second image.
+    """
+    if a.size() != b.size():
+        return 1.0
+    if a.isNull():
+        return 0.0
+    pixelsA = pixmapToArray(a)[::2, ::2].astype(np.int16)
+    pixelsB = pixmapToArray(b)[::2, ::2]
+    return float(np.abs(pixelsA - pixelsB).mean()) / 255
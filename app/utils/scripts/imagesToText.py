@@ -0,0 +1,67 @@
+"""
+Cloe Helper Functions
+
+Copyright (C) `2021-2022` `<Alarcon Ace Belen>`
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <http://www.gnu.org/licenses/>.
+"""
+
+from threading import Event
+from typing import Optional, Union
+
+from PIL import Image
+
+from utils.ocr import BaseEngine, ContentGate, MicroBatcher, OCRCache
+from utils.timeline import timeline
+
+
+def imagesToText(
+    images: list[Image.Image],
+    model: Optional[Union[BaseEngine, MicroBatcher]] = None,
+    cache: Optional[OCRCache] = None,
+    gate: Optional[ContentGate] = None,
+    cancelEvent: Optional[Event] = None,
+) -> list[str]:
+    """
+    Convert Pillow images to text using the model in one batch, reusing cached
+    results if any. Images the gate rejects are not converted. The texts are
+    returned in the same order as the images. Setting the cancelEvent stops the
+    model early, and the partial texts are not cached.
+    """
+
+    texts = [""] * len(images)
+    pending: dict[int, Image.Image] = {}
+
+    for i, image in enumerate(images):
+        if gate is not None and not gate.accepts(image):
+            continue
+        text = cache.get(image) if cache is not None else None
+        if text is None:
+            pending[i] = image
+        else:
+            texts[i] = text
+
+    if model is not None and pending:
+        misses = list(pending.values())
+        cancelEvents = [cancelEvent] * len(misses) if cancelEvent else None
+        results = model.ocrBatch(misses, cancelEvents)
+        cancelled = cancelEvent is not None and cancelEvent.is_set()
+        if not cancelled:
+            timeline.mark("firstOcrServed")
+        for i, image, text in zip(pending, misses, results):
+            texts[i] = text.strip()
+            if cache is not None and not cancelled:
+                cache.put(image, texts[i])
+
+    return texts
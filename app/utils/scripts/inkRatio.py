@@ -0,0 +1,63 @@
+"""
+Cloe Helper Functions
+
+Copyright (C) `2021-2022` `<Alarcon Ace Belen>`
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <http://www.gnu.org/licenses/>.
+"""
+
+from typing import Union
+
+import numpy as np
+from PyQt5.QtGui import QImage, QPixmap
+
+from .pixmapToArray import pixmapToArray
+
+
+def grayLevels(pixels: np.ndarray) -> np.ndarray:
+    # The channel mean is close enough to the gray level to tell ink apart
+    total = pixels[..., 0].astype(np.int16) + pixels[..., 1] + pixels[..., 2]
+    return total // 3
+
+
+def inkRatio(
+    images: list[Union[QPixmap, QImage]],
+    reference: Union[QPixmap, QImage],
+    contrast=48,
+) -> float:
+    """Returns the largest fraction of the pixels of the images that stand out as ink
+
+    A pixel is ink if its gray level differs from the background of the reference
+    by at least contrast. The background is the median gray level of the reference,
+    like the ContentGate's.
+
+    Args:
+        images (list[QPixmap | QImage]): Images whose pixels are counted, such as
+        strips of the reference.
+        reference (QPixmap | QImage): Image the background is taken from.
+        contrast (int, optional): Minimum difference in gray levels. Defaults to 48.
+    """
+    images = [image for image in images if not image.isNull()]
+    if not images or reference.isNull():
+        return 0.0
+    # Every other row and column is plenty to find the background
+    levels = grayLevels(pixmapToArray(reference)[::2, ::2])
+    histogram = np.bincount(levels.ravel(), minlength=256)
+    background = int(np.searchsorted(np.cumsum(histogram), histogram.sum() / 2))
+    return max(
+        float(
+            (np.abs(grayLevels(pixmapToArray(image)) - background) >= contrast).mean()
+        )
+        for image in images
+    )
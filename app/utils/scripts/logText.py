@@ -21,6 +21,8 @@ from os import path as osPath
 
 from PyQt5.QtGui import QGuiApplication
 
+from utils.tracing import tracer
+
 
 def logText(text: str, *, saveLog=False, path=".") -> None:
     """Helper function to log text
@@ -30,8 +32,9 @@ def logText(text: str, *, saveLog=False, path=".") -> None:
         saveLog (bool, optional): Save text to a file if enabled. Defaults to False.
         path (str, optional): Log file location. Defaults to current path.
     """
-    clipboard = QGuiApplication.clipboard()
-    clipboard.setText(text)
+    with tracer.span("logText"):
+        clipboard = QGuiApplication.clipboard()
+        clipboard.setText(text)
 
     if saveLog:
         filename = "log.txt"
@@ -0,0 +1,75 @@
+"""
+Cloe Helper Functions
+
+Copyright (C) `2021-2022` `<Alarcon Ace Belen>`
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <http://www.gnu.org/licenses/>.
+"""
+
+import sys
+from typing import Union
+
+import numpy as np
+from PyQt5.QtGui import QImage, QPixmap
+
+# Formats whose pixels are stored as a native-endian 32-bit 0xAARRGGBB word
+_NATIVE_FORMATS = (
+    QImage.Format_RGB32,
+    QImage.Format_ARGB32,
+    QImage.Format_ARGB32_Premultiplied,
+)
+
+
+def toRGB32(pixmap: Union[QPixmap, QImage]) -> QImage:
+    """
+    Returns the pixmap as a 32-bit QImage, converting only when necessary
+    """
+    image = pixmap.toImage() if isinstance(pixmap, QPixmap) else pixmap
+    if image.format() not in _NATIVE_FORMATS:
+        image = image.convertToFormat(QImage.Format_RGB32)
+    return image
+
+
+def rawModeRGB32() -> str:
+    """
+    Returns the PIL raw mode of a 32-bit QImage on this platform
+    """
+    return "BGRX" if sys.byteorder == "little" else "XRGB"
+
+
+def pixmapToArray(pixmap: Union[QPixmap, QImage]) -> np.ndarray:
+    """Convert QPixmap or QImage object to an RGB array without encoding
+
+    The pixel buffer of the image is wrapped as-is and copied exactly once
+    into a contiguous (height, width, 3) uint8 array that owns its memory.
+
+    Args:
+        pixmap (QPixmap | QImage): Image to convert.
+    """
+    image = toRGB32(pixmap)
+    if image.isNull():
+        return np.empty((0, 0, 3), dtype=np.uint8)
+
+    width, height, stride = image.width(), image.height(), image.bytesPerLine()
+    bits = image.constBits()
+    bits.setsize(image.sizeInBytes())
+
+    rows = np.frombuffer(bits, dtype=np.uint8).reshape(height, stride)
+    pixels = rows[:, : width * 4].reshape(height, width, 4)
+    # Reorder the channels to RGB while copying once
+    order = (2, 1, 0) if sys.byteorder == "little" else (1, 2, 3)
+    array = np.empty((height, width, 3), dtype=np.uint8)
+    for channel, source in enumerate(order):
+        array[..., channel] = pixels[..., source]
+    return array
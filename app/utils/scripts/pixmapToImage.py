@@ -0,0 +1,51 @@
+"""
+Cloe Helper Functions
+
+Copyright (C) `2021-2022` `<Alarcon Ace Belen>`
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <http://www.gnu.org/licenses/>.
+"""
+
+from typing import Optional, Union
+
+from PIL import Image
+from PyQt5.QtGui import QImage, QPixmap
+
+from .pixmapToArray import rawModeRGB32, toRGB32
+
+
+def pixmapToImage(pixmap: Union[QPixmap, QImage]) -> Optional[Image.Image]:
+    """Convert QPixmap or QImage object to a PIL image without encoding
+
+    The pixel buffer of the image is decoded directly by PIL, which copies
+    it exactly once. Returns None if the pixmap is empty.
+
+    Args:
+        pixmap (QPixmap | QImage): Image to convert.
+    """
+    image = toRGB32(pixmap)
+    if image.isNull():
+        return None
+
+    bits = image.constBits()
+    bits.setsize(image.sizeInBytes())
+    return Image.frombuffer(
+        "RGB",
+        (image.width(), image.height()),
+        bits,
+        "raw",
+        rawModeRGB32(),
+        image.bytesPerLine(),
+        1,
+    )
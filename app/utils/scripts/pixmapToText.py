@@ -17,32 +17,62 @@ You should have received a copy of the GNU General Public License
 along with this program.  If not, see <http://www.gnu.org/licenses/>.
 """
 
-from io import BytesIO
-from typing import Optional
+from threading import Event
+from typing import Callable, Optional, Union
 
-from manga_ocr import MangaOcr
-from PIL import Image
-from PyQt5.QtCore import QBuffer
 from PyQt5.QtGui import QPixmap
 
+from .pixmapToImage import pixmapToImage
+from utils.ocr import BaseEngine, ContentGate, MicroBatcher, OCRCache
+from utils.timeline import timeline
+from utils.tracing import tracer
 
-def pixmapToText(pixmap: QPixmap, model: Optional[MangaOcr] = None) -> str:
+
+def pixmapToText(
+    pixmap: QPixmap,
+    model: Optional[Union[BaseEngine, MicroBatcher]] = None,
+    cache: Optional[OCRCache] = None,
+    cancelEvent: Optional[Event] = None,
+    gate: Optional[ContentGate] = None,
+    onProgress: Optional[Callable[[str], None]] = None,
+    inferenceEvent: Optional[Event] = None,
+) -> str:
     """
-    Convert QPixmap object to text using the model
+    Convert QPixmap object to text using the model, reusing cached results if any.
+    Crops the gate rejects are not converted. Setting the cancelEvent stops the
+    model early, and onProgress is called with the partial text as it is generated.
+    The inferenceEvent is set once the crop reaches the model.
     """
 
-    buffer = QBuffer()
-    buffer.open(QBuffer.ReadWrite)
-    pixmap.save(buffer, "PNG")
-    bytes = BytesIO(buffer.data())
+    with tracer.span("pixmapToImage"):
+        pillowImage = pixmapToImage(pixmap)
 
-    if bytes.getbuffer().nbytes == 0:
+    if pillowImage is None:
         return ""
 
-    pillowImage = Image.open(bytes)
+    if gate is not None:
+        with tracer.span("contentGate"):
+            accepted = gate.accepts(pillowImage)
+        if not accepted:
+            return ""
+
+    if cache is not None:
+        with tracer.span("cacheGet"):
+            text = cache.get(pillowImage)
+        if text is not None:
+            return text
+
     text = ""
 
     if model is not None:
-        text = model(pillowImage)
+        if inferenceEvent is not None:
+            inferenceEvent.set()
+        with tracer.span("inference"):
+            text = model.ocr(pillowImage, cancelEvent, onProgress).strip()
+        if cancelEvent is not None and cancelEvent.is_set():
+            return text
+        timeline.mark("firstOcrServed")
+        if cache is not None:
+            cache.put(pillowImage, text)
 
-    return text.strip()
+    return text
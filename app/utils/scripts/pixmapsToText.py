@@ -0,0 +1,48 @@
+"""
+Cloe Helper Functions
+
+Copyright (C) `2021-2022` `<Alarcon Ace Belen>`
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <http://www.gnu.org/licenses/>.
+"""
+
+from typing import Optional, Union
+
+from PyQt5.QtGui import QPixmap
+
+from .imagesToText import imagesToText
+from .pixmapToImage import pixmapToImage
+from utils.ocr import BaseEngine, ContentGate, MicroBatcher, OCRCache
+
+
+def pixmapsToText(
+    pixmaps: list[QPixmap],
+    model: Optional[Union[BaseEngine, MicroBatcher]] = None,
+    cache: Optional[OCRCache] = None,
+    gate: Optional[ContentGate] = None,
+) -> list[str]:
+    """
+    Convert QPixmap objects to text using the model in one batch, reusing cached
+    results if any. Crops the gate rejects are not converted. The texts are
+    returned in the same order as the pixmaps.
+    """
+
+    texts = [""] * len(pixmaps)
+    images = {i: pixmapToImage(pixmap) for i, pixmap in enumerate(pixmaps)}
+    images = {i: image for i, image in images.items() if image is not None}
+
+    for i, text in zip(images, imagesToText(list(images.values()), model, cache, gate)):
+        texts[i] = text
+
+    return texts
@@ -0,0 +1,42 @@
+"""
+Cloe Helper Functions
+
+Copyright (C) `2021-2022` `<Alarcon Ace Belen>`
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <http://www.gnu.org/licenses/>.
+"""
+
+from typing import Any
+
+from PyQt5.QtCore import QSettings
+
+
+def readSettings(file: str, defaults: dict[str, Any]) -> dict[str, Any]:
+    """Reads settings without a settings widget
+
+    Args:
+        file (str): Path to configuration file. Must be in ini format.
+        defaults (dict[str, Any]): Default values of the properties to read.
+        Each value is cast to the type of its default.
+    """
+    settings = QSettings(file, QSettings.IniFormat)
+    values = {}
+    for propName, propDefault in defaults.items():
+        prop = settings.value(propName, propDefault)
+        if isinstance(propDefault, bool):
+            prop = str(prop).lower() == "true"
+        elif isinstance(propDefault, (int, float, str)):
+            prop = type(propDefault)(prop)
+        values[propName] = prop
+    return values
@@ -0,0 +1,37 @@
+"""
+Cloe Helper Functions
+
+Copyright (C) `2021-2022` `<Alarcon Ace Belen>`
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <http://www.gnu.org/licenses/>.
+"""
+
+from PyQt5.QtCore import QRect
+
+
+def sortReadingOrder(rects: list[QRect]) -> list[QRect]:
+    """
+    Sorts rects in manga reading order: top-to-bottom, then right-to-left.
+    Rects that overlap vertically belong to the same row.
+    """
+    rows: list[list[QRect]] = []
+    rowBottom = 0
+    for rect in sorted(rects, key=lambda r: r.top()):
+        if rows and rect.top() <= rowBottom:
+            rows[-1].append(rect)
+            rowBottom = max(rowBottom, rect.bottom())
+        else:
+            rows.append([rect])
+            rowBottom = rect.bottom()
+    return [rect for row in rows for rect in sorted(row, key=lambda r: -r.right())]
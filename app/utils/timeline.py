@@ -0,0 +1,161 @@
+"""
+Cloe Startup Timeline
+
+Copyright (C) `2021-2022` `<Alarcon Ace Belen>`
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <http://www.gnu.org/licenses/>.
+"""
+
+import json
+import logging
+import os
+import sys
+import time
+from datetime import datetime
+from threading import Lock
+from time import monotonic
+from typing import Optional
+
+from utils.constants import APP_VERSION, STARTUP_LOG
+
+logger = logging.getLogger(__name__)
+
+# Startup milestones, in the order they are expected to happen
+MILESTONES = [
+    "processStart",
+    "appCreated",
+    "trayShown",
+    "importsDone",
+    "modelConstructed",
+    "warmupDone",
+    "firstOcrServed",
+]
+
+
+# ------------------------------- Helper Functions -------------------------------- #
+
+
+def processAge() -> float:
+    """
+    Returns the seconds since the process was created, read from the OS
+    """
+    if sys.platform.startswith("linux"):
+        with open("/proc/self/stat") as fh:
+            # The fields after the command name, which may contain spaces
+            fields = fh.read().rsplit(")", 1)[1].split()
+        # starttime, the 22nd field, is in clock ticks since boot
+        started = int(fields[19]) / os.sysconf("SC_CLK_TCK")
+        return time.clock_gettime(time.CLOCK_BOOTTIME) - started
+    if sys.platform == "win32":
+        import ctypes
+        from ctypes import wintypes
+
+        creation, exitTime, kernel, user = (wintypes.FILETIME() for _ in range(4))
+        kernel32 = ctypes.windll.kernel32
+        if not kernel32.GetProcessTimes(
+            kernel32.GetCurrentProcess(),
+            ctypes.byref(creation),
+            ctypes.byref(exitTime),
+            ctypes.byref(kernel),
+            ctypes.byref(user),
+        ):
+            raise ctypes.WinError()
+        # FILETIME counts 100 ns intervals since 1601
+        ticks = (creation.dwHighDateTime << 32) | creation.dwLowDateTime
+        return time.time() - (ticks / 1e7 - 11644473600)
+    raise OSError(f"The process creation time is not known on {sys.platform}")
+
+
+def processStart() -> float:
+    """
+    Returns the time the process was created on the monotonic clock, or the current
+    time where the OS does not tell
+    """
+    now = monotonic()
+    try:
+        return now - max(processAge(), 0.0)
+    except Exception:
+        return now
+
+
+class Timeline:
+    """Monotonic timestamps of the startup milestones
+
+    The timeline starts when the process was created, or where the OS does not tell,
+    when this module is first imported. Once every milestone is marked, the timeline
+    is appended as one JSON line to the startup log.
+
+    Args:
+        path (str, optional): Path to the startup log. Defaults to STARTUP_LOG.
+    """
+
+    def __init__(self, path: Optional[str] = STARTUP_LOG):
+        self.path = path
+        self._start = processStart()
+        self._marks: dict[str, float] = {MILESTONES[0]: 0.0}
+        self._lock = Lock()
+        self._saved = False
+
+    def mark(self, name: str):
+        """
+        Records the time of the milestone, unless it was already recorded
+        """
+        with self._lock:
+            if name in self._marks:
+                return
+            self._marks[name] = monotonic() - self._start
+            isComplete = all(m in self._marks for m in MILESTONES)
+        if isComplete:
+            self.save()
+
+    def marks(self) -> dict[str, float]:
+        """
+        Returns the seconds since process start of each recorded milestone
+        """
+        with self._lock:
+            return dict(sorted(self._marks.items(), key=lambda m: m[1]))
+
+    def save(self):
+        with self._lock:
+            if self._saved or not self.path:
+                return
+            self._saved = True
+        record = {
+            "version": APP_VERSION,
+            "date": datetime.now().isoformat(timespec="seconds"),
+            "marks": self.marks(),
+        }
+        try:
+            with open(self.path, "a", encoding="utf-8") as fh:
+                fh.write(json.dumps(record) + "\n")
+        except OSError as e:
+            logger.warning("Could not save the startup timeline: %s", e)
+
+    def format(self) -> str:
+        """
+        Formats the milestones as lines of elapsed and delta times
+        """
+        lines = []
+        previous = 0.0
+        for name, elapsed in self.marks().items():
+            lines.append(f"{name}: {elapsed:.3f} s (+{elapsed - previous:.3f} s)")
+            previous = elapsed
+        pending = [m for m in MILESTONES if m not in self._marks]
+        if pending:
+            lines.append(f"Pending: {', '.join(pending)}")
+        return "\n".join(lines)
+
+
+# Created on the first import, which main.py does before anything else
+timeline = Timeline()
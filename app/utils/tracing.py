@@ -0,0 +1,177 @@
+"""
+Cloe Tracing
+
+Copyright (C) `2021-2022` `<Alarcon Ace Belen>`
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <http://www.gnu.org/licenses/>.
+"""
+
+import json
+import os
+from collections import deque
+from contextlib import nullcontext
+from datetime import datetime
+from threading import Lock, current_thread, get_ident
+from time import perf_counter
+from typing import ContextManager
+
+from utils.constants import TRACE_DIR
+
+# Number of spans kept, older spans are dropped
+TRACE_CAPACITY = 4096
+
+# Returned by span() while tracing is off, shared so nothing is allocated
+NULL_SPAN = nullcontext()
+
+
+class Span:
+    """
+    Context manager recording the time spent in its block as a span of the tracer
+    """
+
+    __slots__ = ("tracer", "name", "start")
+
+    def __init__(self, tracer: "Tracer", name: str):
+        self.tracer = tracer
+        self.name = name
+
+    def __enter__(self):
+        self.start = perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.tracer.add(self.name, self.start, perf_counter())
+
+
+class Tracer:
+    """Spans of the OCR pipeline stages, kept in a ring buffer
+
+    Spans are only recorded while the tracer is enabled. While it is disabled,
+    span() returns a shared context manager that does nothing.
+
+    Args:
+        capacity (int, optional): Number of spans kept. Defaults to TRACE_CAPACITY.
+        enabled (bool, optional): Whether to record spans. Defaults to False.
+    """
+
+    def __init__(self, capacity=TRACE_CAPACITY, enabled=False):
+        self.enabled = enabled
+        # Name, start and duration in seconds, and thread of each span
+        self._spans: deque[tuple[str, float, float, int]] = deque(maxlen=capacity)
+        self._threads: dict[int, str] = {}
+        self._lock = Lock()
+
+    def span(self, name: str) -> ContextManager:
+        """
+        Returns a context manager recording its block as a span with the given name
+        """
+        if not self.enabled:
+            return NULL_SPAN
+        return Span(self, name)
+
+    def add(self, name: str, start: float, end: float):
+        """Records a span measured elsewhere
+
+        Args:
+            name (str): Stage of the span.
+            start (float): Start of the span, from perf_counter.
+            end (float): End of the span, from perf_counter.
+        """
+        ident = get_ident()
+        with self._lock:
+            if ident not in self._threads:
+                self._threads[ident] = current_thread().name
+            self._spans.append((name, start, end - start, ident))
+
+    def clear(self):
+        with self._lock:
+            self._spans.clear()
+
+    def stats(self) -> dict[str, dict[str, float]]:
+        """
+        Returns the count and the p50/p95 duration in ms of each stage, over the
+        spans in the buffer
+        """
+        with self._lock:
+            spans = list(self._spans)
+        durations: dict[str, list[float]] = {}
+        for name, _, duration, _ in spans:
+            durations.setdefault(name, []).append(duration * 1000)
+
+        report = {}
+        for name, values in durations.items():
+            values.sort()
+            at = lambda q: values[min(int(len(values) * q), len(values) - 1)]
+            report[name] = {"count": len(values), "p50Ms": at(0.5), "p95Ms": at(0.95)}
+        return report
+
+    def format(self) -> str:
+        """
+        Formats the stats as one line per stage
+        """
+        lines = [
+            f"{name}: p50 {s['p50Ms']:.2f} ms, p95 {s['p95Ms']:.2f} ms ({s['count']})"
+            for name, s in sorted(self.stats().items())
+        ]
+        return "\n".join(lines) or "No spans recorded"
+
+    def chromeTrace(self) -> dict:
+        """
+        Returns the spans in the Chrome trace event format, which chrome://tracing
+        and Perfetto open
+        """
+        pid = os.getpid()
+        with self._lock:
+            spans = list(self._spans)
+            threads = dict(self._threads)
+
+        events = [
+            {
+                "name": "thread_name",
+                "ph": "M",
+                "pid": pid,
+                "tid": ident,
+                "args": {"name": name},
+            }
+            for ident, name in threads.items()
+        ]
+        for name, start, duration, ident in spans:
+            events.append(
+                {
+                    "name": name,
+                    "cat": "ocr",
+                    "ph": "X",
+                    "ts": start * 1e6,
+                    "dur": duration * 1e6,
+                    "pid": pid,
+                    "tid": ident,
+                }
+            )
+        return {"traceEvents": events, "displayTimeUnit": "ms"}
+
+    def dump(self, directory: str = TRACE_DIR) -> str:
+        """
+        Writes the spans as a Chrome trace to a new file in the directory, returning
+        its path
+        """
+        os.makedirs(directory, exist_ok=True)
+        name = datetime.now().strftime("cloe-trace-%Y%m%d-%H%M%S.json")
+        path = os.path.join(directory, name)
+        with open(path, "w", encoding="utf-8") as fh:
+            json.dump(self.chromeTrace(), fh)
+        return path
+
+
+# Shared by every instrumented module, enabled from the tray menu
+tracer = Tracer()